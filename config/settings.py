@@ -29,6 +29,7 @@ class BotConfig:
     MAX_USER_STATES: int = int(os.getenv("MAX_USER_STATES", "100"))
     CLEANUP_INTERVAL: int = int(os.getenv("CLEANUP_INTERVAL", "3600"))  # 1 hora
     MAX_DB_CONNECTIONS: int = int(os.getenv("MAX_DB_CONNECTIONS", "5"))
+    BOT_WORKER_THREADS: int = int(os.getenv("BOT_WORKER_THREADS", "2"))
     
     # Configuración del servidor Flask (para Render)
     FLASK_PORT: int = int(os.getenv("PORT", "5000"))
@@ -117,6 +118,9 @@ class BotConstants:
     # Tipos de movimientos
     MOVEMENT_TYPES = ["ingreso", "gasto", "ahorro"]
     
+    # Emoji por tipo de movimiento
+    MOVEMENT_EMOJIS = {"ingreso": INCOME, "gasto": EXPENSE, "ahorro": SAVINGS}
+    
     # Tipos de deuda
     DEBT_TYPES = ["positiva", "negativa"]  # positiva = te deben, negativa = tú debes
     
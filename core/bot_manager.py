@@ -36,6 +36,9 @@ class BotManager:
         self.callback_handlers: Optional[CallbackHandlers] = None
         self.message_handlers: Optional[MessageHandlers] = None
         
+        # Usuario autorizado (fijo durante toda la ejecución)
+        self.authorized_user_id = config.AUTHORIZED_USER_ID
+        
         # Estados y control
         self.user_states: Dict[int, Dict[str, Any]] = {}
         self.is_running = False
@@ -47,7 +50,8 @@ class BotManager:
             self.bot = telebot.TeleBot(
                 self.config.BOT_TOKEN,
                 parse_mode=None,  # No usar parse_mode por defecto para evitar errores
-                threaded=True
+                threaded=True,
+                num_threads=self.config.BOT_WORKER_THREADS  # Pool fijo de workers para los handlers
             )
             
             # Configurar comandos del bot
@@ -148,11 +152,24 @@ class BotManager:
             app = create_flask_app()
             
             def run_flask():
-                app.run(
+                try:
+                    from waitress import serve
+                except ImportError:
+                    # Sin waitress se usa el servidor de desarrollo de Flask
+                    app.run(
+                        host=self.config.FLASK_HOST,
+                        port=self.config.FLASK_PORT,
+                        debug=False,
+                        use_reloader=False
+                    )
+                    return
+                
+                serve(
+                    app,
                     host=self.config.FLASK_HOST,
                     port=self.config.FLASK_PORT,
-                    debug=False,
-                    use_reloader=False
+                    threads=2,
+                    connection_limit=50
                 )
             
             self.flask_thread = threading.Thread(target=run_flask, daemon=True)
@@ -239,7 +256,7 @@ class BotManager:
     
     def is_authorized(self, user_id: int) -> bool:
         """Verifica si el usuario está autorizado"""
-        return user_id == self.config.AUTHORIZED_USER_ID
+        return user_id == self.authorized_user_id
     
     def get_user_state(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Obtiene el estado actual del usuario"""
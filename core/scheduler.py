@@ -6,7 +6,7 @@ import logging
 import threading
 import time
 import schedule
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from typing import Optional
 import gc
 from utils.error_handler import ErrorHandler
@@ -23,17 +23,16 @@ class TaskScheduler:
         self.db = bot_manager.db
         self.scheduler_thread: Optional[threading.Thread] = None
         self.running = False
+        # (mes, año) del último resumen mensual enviado
+        self._ultimo_resumen: Optional[tuple] = None
         
         self._setup_scheduled_tasks()
     
     def _setup_scheduled_tasks(self):
         """Configura todas las tareas programadas"""
         try:
-            # Verificar suscripciones cada hora
-            schedule.every().hour.do(self._safe_run, self._verificar_suscripciones)
-            
-            # Verificar recordatorios cada hora
-            schedule.every().hour.do(self._safe_run, self._verificar_recordatorios)
+            # Verificar suscripciones y recordatorios cada hora
+            schedule.every().hour.do(self._safe_run, self._verificacion_horaria)
             
             # Backup diario a las 2 AM
             schedule.every().day.at("02:00").do(self._safe_run, self._realizar_backup)
@@ -42,7 +41,7 @@ class TaskScheduler:
             schedule.every().sunday.at("03:00").do(self._safe_run, self._limpiar_datos_antiguos)
             
             # Resumen mensual el día 1 a las 8 AM
-            schedule.every().day.at("08:00").do(self._safe_run, self._generar_resumen_mensual)
+            schedule.every().day.at("08:00").do(self._resumen_mensual_si_corresponde)
             
             # Limpieza de memoria cada 4 horas
             schedule.every(4).hours.do(self._safe_run, self._limpiar_memoria)
@@ -93,6 +92,11 @@ class TaskScheduler:
             logger.error(f"Error ejecutando tarea {task_func.__name__}: {e}")
             ErrorHandler.log_database_error(task_func.__name__, e)
     
+    def _verificacion_horaria(self):
+        """Ejecuta las verificaciones horarias en una sola tarea"""
+        self._verificar_suscripciones()
+        self._verificar_recordatorios()
+    
     def _verificar_suscripciones(self):
         """Verifica y procesa suscripciones pendientes"""
         try:
@@ -103,18 +107,17 @@ class TaskScheduler:
             
             logger.info(f"Procesando {len(suscripciones_pendientes)} suscripciones pendientes")
             
-            for suscripcion in suscripciones_pendientes:
-                suscripcion_id = suscripcion[0]
-                
-                # Procesar suscripción
-                resultado = self.db.procesar_suscripcion(suscripcion_id)
-                
-                if resultado:
-                    # Notificar al usuario
-                    self._notificar_suscripcion_procesada(resultado)
-                    logger.info(f"Suscripción procesada: {resultado['nombre']} - ${resultado['monto']}")
-                else:
-                    logger.error(f"Error procesando suscripción {suscripcion_id}")
+            # Procesar todas las suscripciones en una sola transacción
+            procesadas = self.db.procesar_suscripciones(suscripciones_pendientes)
+            
+            if not procesadas:
+                logger.error("Error procesando suscripciones pendientes")
+                return
+            
+            # Notificar al usuario después de confirmar los cobros
+            for resultado in procesadas:
+                self._notificar_suscripcion_procesada(resultado)
+                logger.info(f"Suscripción procesada: {resultado['nombre']} - ${resultado['monto']}")
             
         except Exception as e:
             logger.error(f"Error verificando suscripciones: {e}")
@@ -129,12 +132,14 @@ class TaskScheduler:
             
             logger.info(f"Procesando {len(recordatorios_pendientes)} recordatorios pendientes")
             
-            for recordatorio in recordatorios_pendientes:
-                # Enviar recordatorio
-                self._enviar_recordatorio(recordatorio)
-                
-                # Marcar como procesado
-                self.db.marcar_recordatorio_procesado(recordatorio['id'])
+            # Enviar recordatorios y acumular los entregados
+            procesados = [
+                recordatorio['id'] for recordatorio in recordatorios_pendientes
+                if self._enviar_recordatorio(recordatorio)
+            ]
+            
+            # Marcar como procesados en una sola transacción
+            self.db.marcar_recordatorios_procesados(procesados)
                 
         except Exception as e:
             logger.error(f"Error verificando recordatorios: {e}")
@@ -145,49 +150,30 @@ class TaskScheduler:
             if not self.bot_manager.config.BACKUP_ENABLED:
                 return
             
-            import csv
-            import tempfile
-            import os
+            import gzip
+            import io
             
-            # Crear archivo temporal
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv', encoding='utf-8') as f:
-                backup_path = f.name
-                
-                # Obtener datos de movimientos
-                with self.db.pool.get_connection() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute('''
-                        SELECT fecha, tipo, categoria, monto, descripcion, mes, año
-                        FROM movimientos 
-                        WHERE user_id = ?
-                        ORDER BY fecha DESC
-                    ''', (self.bot_manager.config.AUTHORIZED_USER_ID,))
-                    
-                    rows = cursor.fetchall()
-                    
-                    if rows:
-                        writer = csv.writer(f)
-                        # Escribir cabeceras
-                        writer.writerow(['Fecha', 'Tipo', 'Categoria', 'Monto', 'Descripcion', 'Mes', 'Año'])
-                        # Escribir datos
-                        for row in rows:
-                            writer.writerow(row)
+            # Comprimir los movimientos directamente en memoria
+            buffer = io.BytesIO()
+            with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=6) as gz, \
+                    io.TextIOWrapper(gz, encoding='utf-8', newline='') as f:
+                total = self.db.exportar_movimientos_csv(self.bot_manager.config.AUTHORIZED_USER_ID, f)
             
             # Enviar archivo al usuario si hay datos
-            if rows:
+            if total:
                 try:
-                    with open(backup_path, 'rb') as f:
-                        fecha_str = datetime.now().strftime("%Y%m%d_%H%M")
-                        filename = f"backup_finanzas_{fecha_str}.csv"
-                        
-                        self.bot.send_document(
-                            self.bot_manager.config.AUTHORIZED_USER_ID,
-                            f,
-                            caption=f"📄 Backup automático - {datetime.now().strftime('%d/%m/%Y %H:%M')}",
-                            visible_file_name=filename
-                        )
-                        
-                    logger.info(f"Backup enviado: {len(rows)} registros")
+                    buffer.seek(0)
+                    fecha_str = datetime.now().strftime("%Y%m%d_%H%M")
+                    filename = f"backup_finanzas_{fecha_str}.csv.gz"
+                    
+                    self.bot.send_document(
+                        self.bot_manager.config.AUTHORIZED_USER_ID,
+                        buffer,
+                        caption=f"📄 Backup automático - {datetime.now().strftime('%d/%m/%Y %H:%M')}",
+                        visible_file_name=filename
+                    )
+                    
+                    logger.info(f"Backup enviado: {total} registros")
                     
                 except Exception as e:
                     logger.error(f"Error enviando backup: {e}")
@@ -197,12 +183,6 @@ class TaskScheduler:
                     self.bot_manager.config.AUTHORIZED_USER_ID,
                     "📄 No hay movimientos para respaldar todavía."
                 )
-            
-            # Limpiar archivo temporal
-            try:
-                os.unlink(backup_path)
-            except:
-                pass
                 
         except Exception as e:
             logger.error(f"Error realizando backup: {e}")
@@ -220,28 +200,29 @@ class TaskScheduler:
         except Exception as e:
             logger.error(f"Error limpiando datos antiguos: {e}")
     
+    def _resumen_mensual_si_corresponde(self):
+        """Lanza el resumen mensual solo el día 1 y una vez por mes"""
+        hoy = date.today()
+        
+        # Los demás días se omiten sin tocar la base de datos ni el GC
+        if hoy.day != 1 or self._ultimo_resumen == (hoy.month, hoy.year):
+            return
+        
+        self._ultimo_resumen = (hoy.month, hoy.year)
+        self._safe_run(self._generar_resumen_mensual)
+    
     def _generar_resumen_mensual(self):
         """Genera y envía resumen mensual automático"""
         try:
-            hoy = date.today()
-            
-            # Solo ejecutar el día 1 del mes
-            if hoy.day != 1:
-                return
-            
             user_id = self.bot_manager.config.AUTHORIZED_USER_ID
             
-            # Calcular mes anterior
-            mes_anterior = hoy.month - 1 if hoy.month > 1 else 12
-            año = hoy.year if hoy.month > 1 else hoy.year - 1
+            # El día anterior al 1 del mes actual pertenece al mes anterior
+            fin_mes_anterior = date.today().replace(day=1) - timedelta(days=1)
+            mes_anterior, año = fin_mes_anterior.month, fin_mes_anterior.year
             
             # Obtener resumen
             resumen = self.db.obtener_resumen_mes(user_id, mes_anterior, año)
             
-            # Formatear mensaje
-            from utils.message_formatter import MessageFormatter
-            formatter = MessageFormatter()
-            
             mensaje = (
                 f"📊 **Resumen Mensual {mes_anterior:02d}/{año}**\n\n"
                 f"📈 **Movimientos:**\n"
@@ -302,8 +283,8 @@ class TaskScheduler:
         except Exception as e:
             logger.error(f"Error enviando notificación de suscripción: {e}")
     
-    def _enviar_recordatorio(self, recordatorio):
-        """Envía un recordatorio al usuario"""
+    def _enviar_recordatorio(self, recordatorio) -> bool:
+        """Envía un recordatorio al usuario; retorna True si se entregó"""
         try:
             mensaje = f"🔔 **Recordatorio**\n\n{recordatorio['descripcion']}"
             
@@ -317,6 +298,8 @@ class TaskScheduler:
             )
             
             logger.info(f"Recordatorio enviado: {recordatorio['descripcion']}")
+            return True
             
         except Exception as e:
-            logger.error(f"Error enviando recordatorio: {e}")
\ No newline at end of file
+            logger.error(f"Error enviando recordatorio: {e}")
+            return False
\ No newline at end of file
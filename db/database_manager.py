@@ -5,14 +5,24 @@ Gestor de base de datos optimizado con pool de conexiones y nuevas funcionalidad
 import sqlite3
 import logging
 import threading
+import calendar
+import csv
 from typing import List, Dict, Optional, Any
 from datetime import date, datetime
 from contextlib import contextmanager
 import gc
 from config.settings import BotConstants
+from utils.records import Movimiento, Suscripcion, Recordatorio, Deuda
 
 logger = logging.getLogger(__name__)
 
+# Columna de resumen_mensual que acumula cada tipo de movimiento
+_RESUMEN_COLUMNAS = {
+    "ingreso": "total_ingresos",
+    "gasto": "total_gastos",
+    "ahorro": "total_ahorros",
+}
+
 class ConnectionPool:
     """Pool de conexiones SQLite thread-safe"""
     
@@ -34,14 +44,16 @@ class ConnectionPool:
                     conn = sqlite3.connect(
                         self.database_path,
                         timeout=30,
-                        check_same_thread=False
+                        check_same_thread=False,
+                        cached_statements=256  # Reutilizar sentencias preparadas entre llamadas
                     )
                     conn.row_factory = sqlite3.Row
-                    # Optimizaciones SQLite
+                    # Optimizaciones SQLite (solo al abrir cada conexión nueva)
                     conn.execute("PRAGMA journal_mode=WAL")
                     conn.execute("PRAGMA synchronous=NORMAL")
-                    conn.execute("PRAGMA cache_size=10000")
+                    conn.execute("PRAGMA cache_size=-20000")  # ~20 MB por conexión
                     conn.execute("PRAGMA temp_store=MEMORY")
+                    conn.execute("PRAGMA mmap_size=134217728")  # 128 MB de lectura mapeada
             
             yield conn
             
@@ -83,6 +95,11 @@ class DatabaseManager:
         self.timeout = timeout
         self.pool = ConnectionPool(database_path, max_connections=5)
         
+        # Cache en memoria del balance actual (user_id -> balance)
+        self._balance_cache: Dict[int, float] = {}
+        self._balance_lock = threading.Lock()
+        self._balance_version = 0
+        
     def initialize(self) -> bool:
         """Inicializa todas las tablas de la base de datos"""
         try:
@@ -280,6 +297,8 @@ class DatabaseManager:
             # Índices para recordatorios
             "CREATE INDEX IF NOT EXISTS idx_recordatorios_user_activo ON recordatorios(user_id, activo)",
             "CREATE INDEX IF NOT EXISTS idx_recordatorios_fecha ON recordatorios(fecha_vencimiento, activo)",
+            # Parcial: solo recordatorios activos, para la verificación horaria del scheduler
+            "CREATE INDEX IF NOT EXISTS idx_recordatorios_pendientes ON recordatorios(fecha_vencimiento) WHERE activo = 1",
             
             # Índices para deudas
             "CREATE INDEX IF NOT EXISTS idx_deudas_user_activa ON deudas(user_id, activa)",
@@ -316,7 +335,9 @@ class DatabaseManager:
                     INSERT OR REPLACE INTO usuarios (user_id, balance_inicial, configurado)
                     VALUES (?, ?, 0)
                 ''', (user_id, balance_inicial))
-                return True
+            
+            self._invalidar_balance(user_id)
+            return True
                 
         except Exception as e:
             logger.error(f"Error creando usuario: {e}")
@@ -374,7 +395,10 @@ class DatabaseManager:
                     'UPDATE usuarios SET balance_inicial = ? WHERE user_id = ?',
                     (balance, user_id)
                 )
-                return cursor.rowcount > 0
+                actualizado = cursor.rowcount > 0
+            
+            self._invalidar_balance(user_id)
+            return actualizado
                 
         except Exception as e:
             logger.error(f"Error actualizando balance inicial: {e}")
@@ -513,21 +537,24 @@ class DatabaseManager:
                 ''', (hoy, tipo, categoria, monto, descripcion.strip(), 
                      hoy.month, hoy.year, user_id))
                 
-                # Invalidar cache
-                self._invalidar_resumen_mensual(cursor, user_id, hoy.month, hoy.year)
+                # Actualizar caches
+                self._acumular_resumen_mensual(cursor, user_id, hoy.month, hoy.year, tipo, monto)
                 self._actualizar_balance_diario(cursor, user_id, hoy)
                 
                 # Verificar alertas de límites
                 self._verificar_alertas_limites(cursor, user_id, tipo, monto)
                 
-                return cursor.rowcount > 0
+                insertado = cursor.rowcount > 0
+            
+            self._invalidar_balance(user_id)
+            return insertado
                 
         except Exception as e:
             logger.error(f"Error agregando movimiento: {e}")
             return False
     
     def obtener_movimientos_mes(self, user_id: int, mes: int = None, 
-                               año: int = None, tipo: str = None) -> List[Dict[str, Any]]:
+                               año: int = None, tipo: str = None) -> List[Movimiento]:
         """Obtiene movimientos del mes de forma optimizada"""
         if not mes or not año:
             hoy = date.today()
@@ -553,14 +580,14 @@ class DatabaseManager:
                 
                 movimientos = []
                 for row in cursor.fetchall():
-                    movimientos.append({
-                        'id': row[0],
-                        'fecha': row[1],
-                        'tipo': row[2],
-                        'categoria': row[3],
-                        'monto': row[4],
-                        'descripcion': row[5] or ""
-                    })
+                    movimientos.append(Movimiento(
+                        id=row[0],
+                        fecha=row[1],
+                        tipo=row[2],
+                        categoria=row[3],
+                        monto=row[4],
+                        descripcion=row[5] or ""
+                    ))
                 
                 cursor.close()
                 return movimientos
@@ -593,12 +620,14 @@ class DatabaseManager:
                     WHERE id = ? AND user_id = ?
                 ''', (movimiento_id, user_id))
                 
-                if cursor.rowcount > 0:
+                eliminado = cursor.rowcount > 0
+                if eliminado:
                     # Invalidar cache del resumen mensual
                     self._invalidar_resumen_mensual(cursor, user_id, mes, año)
-                    return True
-                
-                return False
+            
+            if eliminado:
+                self._invalidar_balance(user_id)
+            return eliminado
                 
         except Exception as e:
             logger.error(f"Error eliminando movimiento: {e}")
@@ -607,7 +636,12 @@ class DatabaseManager:
     # ==================== OPERACIONES DE BALANCE Y RESÚMENES ====================
     
     def obtener_balance_actual(self, user_id: int) -> float:
-        """Calcula el balance actual del usuario de forma optimizada"""
+        """Calcula el balance actual del usuario usando cache en memoria"""
+        with self._balance_lock:
+            if user_id in self._balance_cache:
+                return self._balance_cache[user_id]
+            version = self._balance_version
+        
         try:
             with self.pool.get_connection() as conn:
                 cursor = conn.cursor()
@@ -634,8 +668,15 @@ class DatabaseManager:
                 
                 result = cursor.fetchone()
                 total_movimientos = result[0] if result and result[0] else 0.0
-                
-                return balance_inicial + total_movimientos
+            
+            balance = balance_inicial + total_movimientos
+            
+            # Guardar solo si no hubo escrituras mientras se calculaba
+            with self._balance_lock:
+                if version == self._balance_version:
+                    self._balance_cache[user_id] = balance
+            
+            return balance
                 
         except Exception as e:
             logger.error(f"Error calculando balance: {e}")
@@ -692,28 +733,106 @@ class DatabaseManager:
             with self.pool.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Calcular resumen desde movimientos
-                return self._calcular_resumen_mensual(cursor, user_id, mes, año)
+                # Leer totales desde el cache; calcularlos solo si no existen
+                cursor.execute('''
+                    SELECT total_ingresos, total_gastos, total_ahorros
+                    FROM resumen_mensual 
+                    WHERE user_id = ? AND mes = ? AND año = ?
+                    LIMIT 1
+                ''', (user_id, mes, año))
+                
+                result = cursor.fetchone()
+                if not result:
+                    return self._calcular_resumen_mensual(cursor, user_id, mes, año)
+                
+                return {
+                    "mes": mes,
+                    "año": año,
+                    "ingresos": result[0],
+                    "gastos": result[1],
+                    "ahorros": result[2],
+                    "balance": self.obtener_balance_actual(user_id)
+                }
                 
         except Exception as e:
             logger.error(f"Error obteniendo resumen mensual: {e}")
             return {"mes": mes, "año": año, "ingresos": 0, "gastos": 0, "ahorros": 0, "balance": 0}
     
+    def obtener_resumenes_meses(self, user_id: int, meses: int = 6) -> List[Dict[str, Any]]:
+        """Obtiene los resúmenes de los últimos meses con movimientos en una sola consulta"""
+        hoy = date.today()
+        periodo_actual = hoy.year * 12 + hoy.month - 1
+        año_desde, mes_desde = divmod(periodo_actual - meses + 1, 12)
+        mes_desde += 1
+        
+        try:
+            with self.pool.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT año, mes, tipo, SUM(monto)
+                    FROM movimientos 
+                    WHERE user_id = ? AND (año > ? OR (año = ? AND mes >= ?))
+                    GROUP BY año, mes, tipo
+                ''', (user_id, año_desde, año_desde, mes_desde))
+                
+                totales: Dict[tuple, Dict[str, float]] = {}
+                for año, mes, tipo, total in cursor.fetchall():
+                    totales.setdefault((año, mes), {"ingreso": 0, "gasto": 0, "ahorro": 0})[tipo] = total or 0
+            
+            balance = self.obtener_balance_actual(user_id)
+            resumenes = []
+            
+            # Del mes actual hacia atrás, solo meses con ingresos o gastos
+            for periodo in range(periodo_actual, periodo_actual - meses, -1):
+                año, mes = divmod(periodo, 12)
+                mes += 1
+                mes_totales = totales.get((año, mes))
+                
+                if mes_totales and (mes_totales["ingreso"] > 0 or mes_totales["gasto"] > 0):
+                    resumenes.append({
+                        "mes": mes,
+                        "año": año,
+                        "ingresos": mes_totales["ingreso"],
+                        "gastos": mes_totales["gasto"],
+                        "ahorros": mes_totales["ahorro"],
+                        "balance": balance
+                    })
+            
+            return resumenes
+            
+        except Exception as e:
+            logger.error(f"Error obteniendo resúmenes históricos: {e}")
+            return []
+    
     def _calcular_resumen_mensual(self, cursor, user_id: int, mes: int, año: int) -> Dict[str, Any]:
-        """Calcula el resumen mensual"""
+        """Calcula el resumen mensual y lo guarda en cache"""
         try:
-            # Calcular totales del mes
+            # Calcular y guardar los totales en una sola sentencia: SQLite la ejecuta de
+            # forma atómica, así un movimiento insertado en paralelo (que acumula con
+            # UPDATE) no queda pisado por totales calculados antes de su INSERT
             cursor.execute('''
-                SELECT tipo, SUM(monto) 
+                INSERT INTO resumen_mensual 
+                (mes, año, total_ingresos, total_gastos, total_ahorros, user_id)
+                SELECT ?, ?,
+                       COALESCE(SUM(CASE WHEN tipo = 'ingreso' THEN monto END), 0),
+                       COALESCE(SUM(CASE WHEN tipo = 'gasto' THEN monto END), 0),
+                       COALESCE(SUM(CASE WHEN tipo = 'ahorro' THEN monto END), 0),
+                       ?
                 FROM movimientos 
                 WHERE user_id = ? AND mes = ? AND año = ?
-                GROUP BY tipo
-            ''', (user_id, mes, año))
+                ON CONFLICT(mes, año, user_id) DO UPDATE SET
+                    total_ingresos = excluded.total_ingresos,
+                    total_gastos = excluded.total_gastos,
+                    total_ahorros = excluded.total_ahorros,
+                    fecha_actualizacion = CURRENT_TIMESTAMP
+            ''', (mes, año, user_id, user_id, mes, año))
             
-            totales = {"ingreso": 0, "gasto": 0, "ahorro": 0}
-            for tipo, total in cursor.fetchall():
-                if tipo in totales:
-                    totales[tipo] = total or 0
+            cursor.execute('''
+                SELECT total_ingresos, total_gastos, total_ahorros
+                FROM resumen_mensual 
+                WHERE user_id = ? AND mes = ? AND año = ?
+            ''', (user_id, mes, año))
+            ingresos, gastos, ahorros = cursor.fetchone()
             
             # Calcular balance final
             balance_final = self.obtener_balance_actual(user_id)
@@ -721,9 +840,9 @@ class DatabaseManager:
             return {
                 "mes": mes,
                 "año": año,
-                "ingresos": totales["ingreso"],
-                "gastos": totales["gasto"],
-                "ahorros": totales["ahorro"],
+                "ingresos": ingresos,
+                "gastos": gastos,
+                "ahorros": ahorros,
                 "balance": balance_final
             }
             
@@ -750,22 +869,7 @@ class DatabaseManager:
             return False
         
         try:
-            # Calcular próximo cobro
-            hoy = date.today()
-            if dia_cobro <= hoy.day:
-                # Próximo mes
-                if hoy.month == 12:
-                    proximo_cobro = date(hoy.year + 1, 1, min(dia_cobro, 31))
-                else:
-                    proximo_mes = hoy.month + 1
-                    # Ajustar día para meses con menos días
-                    import calendar
-                    max_dia = calendar.monthrange(hoy.year, proximo_mes)[1]
-                    dia_ajustado = min(dia_cobro, max_dia)
-                    proximo_cobro = date(hoy.year, proximo_mes, dia_ajustado)
-            else:
-                # Este mes
-                proximo_cobro = date(hoy.year, hoy.month, dia_cobro)
+            proximo_cobro = self._calcular_proximo_cobro(date.today(), dia_cobro)
             
             with self.pool.get_connection() as conn:
                 cursor = conn.cursor()
@@ -781,7 +885,7 @@ class DatabaseManager:
             logger.error(f"Error agregando suscripción: {e}")
             return False
     
-    def obtener_suscripciones_activas(self, user_id: int) -> List[Dict[str, Any]]:
+    def obtener_suscripciones_activas(self, user_id: int) -> List[Suscripcion]:
         """Obtiene las suscripciones activas del usuario"""
         try:
             with self.pool.get_connection() as conn:
@@ -796,14 +900,14 @@ class DatabaseManager:
                 
                 suscripciones = []
                 for row in cursor.fetchall():
-                    suscripciones.append({
-                        'id': row[0],
-                        'nombre': row[1],
-                        'monto': row[2],
-                        'categoria': row[3],
-                        'dia_cobro': row[4],
-                        'proximo_cobro': row[5]
-                    })
+                    suscripciones.append(Suscripcion(
+                        id=row[0],
+                        nombre=row[1],
+                        monto=row[2],
+                        categoria=row[3],
+                        dia_cobro=row[4],
+                        proximo_cobro=row[5]
+                    ))
                 
                 cursor.close()
                 return suscripciones
@@ -831,69 +935,58 @@ class DatabaseManager:
             logger.error(f"Error obteniendo suscripciones pendientes: {e}")
             return []
     
-    def procesar_suscripcion(self, suscripcion_id: int) -> Optional[Dict[str, Any]]:
-        """Procesa el cobro de una suscripción"""
+    def procesar_suscripciones(self, suscripciones: List[tuple]) -> List[Dict[str, Any]]:
+        """Procesa el cobro de varias suscripciones pendientes en una sola transacción"""
+        if not suscripciones:
+            return []
+        
         try:
+            hoy = date.today()
+            movimientos = []
+            proximos_cobros = []
+            totales_por_usuario: Dict[int, float] = {}
+            procesadas = []
+            
+            for suscripcion_id, nombre, monto, categoria, user_id, dia_cobro in suscripciones:
+                movimientos.append((hoy, categoria, monto, f"Suscripción: {nombre}",
+                                    hoy.month, hoy.year, user_id))
+                proximos_cobros.append((self._calcular_proximo_cobro(hoy, dia_cobro), suscripcion_id))
+                totales_por_usuario[user_id] = totales_por_usuario.get(user_id, 0) + monto
+                procesadas.append({
+                    'nombre': nombre,
+                    'monto': monto,
+                    'categoria': categoria,
+                    'user_id': user_id
+                })
+            
             with self.pool.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Obtener datos de la suscripción
-                cursor.execute('''
-                    SELECT nombre, monto, categoria, dia_cobro, user_id
-                    FROM suscripciones 
-                    WHERE id = ? AND activo = 1
-                    LIMIT 1
-                ''', (suscripcion_id,))
-                
-                result = cursor.fetchone()
-                if not result:
-                    return None
-                
-                nombre, monto, categoria, dia_cobro, user_id = result
-                
-                # Registrar el gasto
-                hoy = date.today()
-                cursor.execute('''
+                # Registrar los gastos
+                cursor.executemany('''
                     INSERT INTO movimientos 
                     (fecha, tipo, categoria, monto, descripcion, mes, año, user_id)
                     VALUES (?, 'gasto', ?, ?, ?, ?, ?, ?)
-                ''', (hoy, categoria, monto, f"Suscripción: {nombre}", 
-                     hoy.month, hoy.year, user_id))
+                ''', movimientos)
                 
-                # Calcular próximo cobro
-                import calendar
-                if hoy.month == 12:
-                    proximo_año = hoy.year + 1
-                    proximo_mes = 1
-                else:
-                    proximo_año = hoy.year
-                    proximo_mes = hoy.month + 1
-                
-                # Ajustar día para meses con menos días
-                max_dia = calendar.monthrange(proximo_año, proximo_mes)[1]
-                dia_ajustado = min(dia_cobro, max_dia)
-                proximo_cobro = date(proximo_año, proximo_mes, dia_ajustado)
-                
-                # Actualizar próximo cobro
-                cursor.execute('''
+                # Actualizar próximos cobros
+                cursor.executemany('''
                     UPDATE suscripciones 
                     SET proximo_cobro = ? 
                     WHERE id = ?
-                ''', (proximo_cobro, suscripcion_id))
+                ''', proximos_cobros)
                 
-                # Invalidar cache
-                self._invalidar_resumen_mensual(cursor, user_id, hoy.month, hoy.year)
-                
-                return {
-                    'nombre': nombre,
-                    'monto': monto,
-                    'categoria': categoria,
-                    'user_id': user_id
-                }
+                # Actualizar cache
+                for user_id, total in totales_por_usuario.items():
+                    self._acumular_resumen_mensual(cursor, user_id, hoy.month, hoy.year, 'gasto', total)
+            
+            for user_id in totales_por_usuario:
+                self._invalidar_balance(user_id)
+            return procesadas
                 
         except Exception as e:
-            logger.error(f"Error procesando suscripción: {e}")
-            return None
+            logger.error(f"Error procesando suscripciones: {e}")
+            return []
     
     def desactivar_suscripcion(self, suscripcion_id: int, user_id: int) -> bool:
         """Desactiva una suscripción"""
@@ -936,7 +1029,7 @@ class DatabaseManager:
             logger.error(f"Error agregando recordatorio: {e}")
             return False
     
-    def obtener_recordatorios_activos(self, user_id: int) -> List[Dict[str, Any]]:
+    def obtener_recordatorios_activos(self, user_id: int) -> List[Recordatorio]:
         """Obtiene los recordatorios activos del usuario"""
         try:
             with self.pool.get_connection() as conn:
@@ -951,12 +1044,12 @@ class DatabaseManager:
                 
                 recordatorios = []
                 for row in cursor.fetchall():
-                    recordatorios.append({
-                        'id': row[0],
-                        'descripcion': row[1],
-                        'monto': row[2],
-                        'fecha_vencimiento': row[3]
-                    })
+                    recordatorios.append(Recordatorio(
+                        id=row[0],
+                        descripcion=row[1],
+                        monto=row[2],
+                        fecha_vencimiento=row[3]
+                    ))
                 
                 cursor.close()
                 return recordatorios
@@ -995,22 +1088,25 @@ class DatabaseManager:
             logger.error(f"Error obteniendo recordatorios pendientes: {e}")
             return []
     
-    def marcar_recordatorio_procesado(self, recordatorio_id: int) -> bool:
-        """Marca un recordatorio como procesado"""
+    def marcar_recordatorios_procesados(self, recordatorio_ids: List[int]) -> int:
+        """Marca varios recordatorios como procesados en una sola transacción"""
+        if not recordatorio_ids:
+            return 0
+        
         try:
             with self.pool.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
+                cursor.executemany('''
                     UPDATE recordatorios 
                     SET activo = 0 
                     WHERE id = ?
-                ''', (recordatorio_id,))
+                ''', [(recordatorio_id,) for recordatorio_id in recordatorio_ids])
                 
-                return cursor.rowcount > 0
+                return cursor.rowcount
                 
         except Exception as e:
-            logger.error(f"Error marcando recordatorio procesado: {e}")
-            return False
+            logger.error(f"Error marcando recordatorios procesados: {e}")
+            return 0
     
     # ==================== OPERACIONES DE DEUDAS ====================
     
@@ -1038,7 +1134,7 @@ class DatabaseManager:
             logger.error(f"Error agregando deuda: {e}")
             return False
     
-    def obtener_deudas_activas(self, user_id: int) -> List[Dict[str, Any]]:
+    def obtener_deudas_activas(self, user_id: int) -> List[Deuda]:
         """Obtiene las deudas activas del usuario"""
         try:
             with self.pool.get_connection() as conn:
@@ -1055,14 +1151,14 @@ class DatabaseManager:
                 for row in cursor.fetchall():
                     # Convertir monto según el tipo
                     monto_real = row[2] if row[3] == 'positiva' else -row[2]
-                    deudas.append({
-                        'id': row[0],
-                        'nombre': row[1],
-                        'monto': monto_real,
-                        'tipo': row[3],
-                        'descripcion': row[4] or "",
-                        'fecha_creacion': row[5]
-                    })
+                    deudas.append(Deuda(
+                        id=row[0],
+                        nombre=row[1],
+                        monto=monto_real,
+                        tipo=row[3],
+                        descripcion=row[4] or "",
+                        fecha_creacion=row[5]
+                    ))
                 
                 return deudas
                 
@@ -1154,6 +1250,18 @@ class DatabaseManager:
     
     # ==================== MÉTODOS AUXILIARES Y OPTIMIZACIÓN ====================
     
+    @staticmethod
+    def _calcular_proximo_cobro(hoy: date, dia_cobro: int) -> date:
+        """Calcula la próxima fecha de cobro posterior a hoy, ajustando el día al fin de mes"""
+        # Este mes, si el día de cobro (ajustado) aún no ha llegado
+        dia = min(dia_cobro, calendar.monthrange(hoy.year, hoy.month)[1])
+        if dia > hoy.day:
+            return date(hoy.year, hoy.month, dia)
+        
+        # Próximo mes
+        año, mes = (hoy.year + 1, 1) if hoy.month == 12 else (hoy.year, hoy.month + 1)
+        return date(año, mes, min(dia_cobro, calendar.monthrange(año, mes)[1]))
+    
     def _verificar_alertas_limites(self, cursor, user_id: int, tipo_movimiento: str, monto: float):
         """Verifica si se superaron los límites de alertas"""
         if tipo_movimiento != 'gasto':
@@ -1316,6 +1424,26 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Error actualizando balance diario: {e}")
     
+    def _acumular_resumen_mensual(self, cursor, user_id: int, mes: int, año: int, 
+                                  tipo: str, monto: float):
+        """Suma un movimiento al cache del resumen mensual si ya existe"""
+        try:
+            # Si la fila no existe, el próximo resumen la recalcula desde movimientos
+            cursor.execute(f'''
+                UPDATE resumen_mensual 
+                SET {_RESUMEN_COLUMNAS[tipo]} = {_RESUMEN_COLUMNAS[tipo]} + ?,
+                    fecha_actualizacion = CURRENT_TIMESTAMP
+                WHERE user_id = ? AND mes = ? AND año = ?
+            ''', (monto, user_id, mes, año))
+        except Exception as e:
+            logger.error(f"Error actualizando cache resumen: {e}")
+    
+    def _invalidar_balance(self, user_id: int):
+        """Invalida el cache en memoria del balance del usuario"""
+        with self._balance_lock:
+            self._balance_version += 1
+            self._balance_cache.pop(user_id, None)
+    
     def _invalidar_resumen_mensual(self, cursor, user_id: int, mes: int, año: int):
         """Invalida el cache del resumen mensual"""
         try:
@@ -1399,6 +1527,36 @@ class DatabaseManager:
             logger.error(f"Error obteniendo estadísticas: {e}")
             return {}
     
+    def exportar_movimientos_csv(self, user_id: int, archivo) -> int:
+        """Escribe los movimientos del usuario en CSV por lotes; retorna el número de filas"""
+        total = 0
+        
+        with self.pool.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.arraysize = 1000
+            cursor.execute('''
+                SELECT fecha, tipo, categoria, monto, descripcion, mes, año
+                FROM movimientos 
+                WHERE user_id = ?
+                ORDER BY fecha DESC
+            ''', (user_id,))
+            
+            writer = csv.writer(archivo)
+            
+            # Leer por lotes para no cargar todo el historial en memoria
+            while True:
+                filas = cursor.fetchmany()
+                if not filas:
+                    break
+                
+                if not total:
+                    writer.writerow(['Fecha', 'Tipo', 'Categoria', 'Monto', 'Descripcion', 'Mes', 'Año'])
+                
+                writer.writerows(filas)
+                total += len(filas)
+        
+        return total
+    
     def realizar_backup_completo(self, user_id: int) -> Dict[str, Any]:
         """Realiza un backup completo de todos los datos del usuario"""
         try:
@@ -5,12 +5,37 @@ Handlers de callbacks (botones inline) optimizados con nuevas funcionalidades
 import logging
 import gc
 from config.settings import BotConstants
-from utils.message_formatter import MessageFormatter
-from utils.markup_builder import MarkupBuilder
+from utils import message_formatter
+from utils import markup_builder
 from utils.error_handler import handle_errors
+from utils.rate_limiter import EditDispatcher
 
 logger = logging.getLogger(__name__)
 
+# Tablas por tipo de movimiento (se construyen una sola vez al importar)
+_EMOJI_BY_TIPO = BotConstants.MOVEMENT_EMOJIS
+_CATEGORIAS_BASICAS = {
+    "ingreso": ("Salario", "Freelance", "Otros"),
+    "gasto": ("Comida", "Transporte", "Otros"),
+    "ahorro": ("Ahorro General", "Inversión", "Emergencia"),
+}
+
+# Ediciones de texto fijo: clave -> (método del formatter, método del markup builder, argumentos)
+_STATIC_EDITS = {
+    "menu_ingresos": ("format_movement_menu", "create_movement_menu_markup", ("ingreso",)),
+    "menu_gastos": ("format_movement_menu", "create_movement_menu_markup", ("gasto",)),
+    "menu_ahorros": ("format_movement_menu", "create_movement_menu_markup", ("ahorro",)),
+    "menu_suscripciones": ("format_subscriptions_menu", "create_subscriptions_menu_markup", ()),
+    "menu_recordatorios": ("format_reminders_menu", "create_reminders_menu_markup", ()),
+    "menu_deudas": ("format_debts_menu", "create_debts_menu_markup", ()),
+    "menu_alertas": ("format_alerts_menu", "create_alerts_menu_markup", ()),
+    "menu_configuracion": ("format_config_menu", "create_config_menu_markup", ()),
+    "agregar_suscripcion": ("format_subscription_name_request", None, ()),
+    "agregar_recordatorio": ("format_reminder_description_request", None, ()),
+    "agregar_deuda": ("format_debt_name_request", None, ()),
+    "agregar_alerta": ("format_alert_type_selection", "create_alert_type_markup", ()),
+}
+
 class CallbackHandlers:
     """Gestiona todos los callbacks del bot de forma optimizada"""
     
@@ -19,8 +44,18 @@ class CallbackHandlers:
         self.bot_manager: BotManager = bot_manager
         self.bot = bot_manager.bot
         self.db = bot_manager.db
-        self.formatter = MessageFormatter()
-        self.markup_builder = MarkupBuilder()
+        self.formatter = message_formatter
+        self.markup_builder = markup_builder
+        self.edit_dispatcher = EditDispatcher(self.bot.edit_message_text)
+        
+        # Texto y markup de las ediciones fijas se construyen una sola vez
+        self._static_edits = {
+            key: (
+                getattr(self.formatter, fmt)(*args),
+                getattr(self.markup_builder, mk)(*args) if mk else None
+            )
+            for key, (fmt, mk, args) in _STATIC_EDITS.items()
+        }
     
     @handle_errors
     def handle_callback_query(self, call):
@@ -65,7 +100,7 @@ class CallbackHandlers:
             
         except Exception as e:
             logger.error(f"Error procesando callback {call.data}: {e}")
-            self.bot.edit_message_text(
+            self._safe_edit(
                 BotConstants.STATUS_MESSAGES["error"],
                 call.message.chat.id,
                 call.message.message_id
@@ -77,7 +112,7 @@ class CallbackHandlers:
     def _handle_new_category_request(self, call, data: str):
         """Maneja la solicitud de crear nueva categoría"""
         user_id = call.from_user.id
-        tipo = data.replace("nueva_categoria_", "")
+        tipo = data[len("nueva_categoria_"):]
         
         if tipo not in BotConstants.MOVEMENT_TYPES:
             logger.error(f"Tipo de categoría inválido: {tipo}")
@@ -92,7 +127,7 @@ class CallbackHandlers:
         
         # Mostrar solicitud de nombre
         mensaje = self.formatter.format_new_category_request(tipo)
-        self.bot.edit_message_text(
+        self._safe_edit(
             mensaje,
             call.message.chat.id,
             call.message.message_id,
@@ -102,15 +137,12 @@ class CallbackHandlers:
     def _handle_select_category(self, call, data: str):
         """Maneja la selección de categoría para movimientos"""
         user_id = call.from_user.id
-        parts = data.split("_", 3)
+        tipo, _, categoria = data[len("select_cat_"):].partition("_")
         
-        if len(parts) < 4:
+        if not categoria:
             logger.error(f"Formato de callback inválido: {data}")
             return
         
-        tipo = parts[2]
-        categoria = parts[3]
-        
         # Guardar estado para pedir monto
         state = {
             "step": f"monto_{tipo}",
@@ -122,10 +154,10 @@ class CallbackHandlers:
         self._set_user_state(user_id, state)
         
         # Mostrar solicitud de monto
-        emoji = BotConstants.INCOME if tipo == "ingreso" else BotConstants.EXPENSE if tipo == "gasto" else "💳"
+        emoji = _EMOJI_BY_TIPO.get(tipo, BotConstants.SAVINGS)
         mensaje = self.formatter.format_amount_request(tipo, categoria, emoji)
         
-        self.bot.edit_message_text(
+        self._safe_edit(
             mensaje,
             call.message.chat.id,
             call.message.message_id,
@@ -136,38 +168,29 @@ class CallbackHandlers:
         """Maneja las acciones relacionadas con suscripciones"""
         if data.startswith("suscripcion_cat_"):
             # Selección de categoría para suscripción
-            categoria = data.replace("suscripcion_cat_", "")
+            categoria = data[len("suscripcion_cat_"):]
             self._process_subscription_category(call, categoria)
     
     def _handle_debt_action(self, call, data: str):
         """Maneja las acciones relacionadas con deudas"""
         if data.startswith("deuda_tipo_"):
-            tipo = data.replace("deuda_tipo_", "")
+            tipo = data[len("deuda_tipo_"):]
             self._process_debt_type_selection(call, tipo)
     
     def _handle_alert_action(self, call, data: str):
         """Maneja las acciones relacionadas con alertas"""
         if data.startswith("alerta_tipo_"):
-            tipo = data.replace("alerta_tipo_", "")
+            tipo = data[len("alerta_tipo_"):]
             self._process_alert_type_selection(call, tipo)
     
     def _handle_menu_navigation(self, call, data: str):
         """Maneja la navegación entre menús"""
-        menu_map = {
-            "menu_ingresos": self._show_income_menu,
-            "menu_gastos": self._show_expense_menu,
-            "menu_ahorros": self._show_savings_menu,
-            "menu_suscripciones": self._show_subscriptions_menu,
-            "menu_recordatorios": self._show_reminders_menu,
-            "menu_deudas": self._show_debts_menu,
-            "menu_alertas": self._show_alerts_menu,
-            "menu_historico": self._show_history_menu,
-            "menu_configuracion": self._show_config_menu
-        }
+        if data.startswith("menu_") and data in self._static_edits:
+            self._static_edit(call, data)
+            return
         
-        handler = menu_map.get(data)
-        if handler:
-            handler(call)
+        if data == "menu_historico":
+            self._show_history_menu(call)
         else:
             logger.warning(f"Menú no encontrado: {data}")
             self._show_main_menu(call)
@@ -196,10 +219,10 @@ class CallbackHandlers:
         elif data == "ver_alertas":
             self._show_active_alerts(call, user_id)
         elif data.startswith("ver_categorias_"):
-            tipo = data.replace("ver_categorias_", "")
+            tipo = data[len("ver_categorias_"):]
             self._show_categories_with_totals(call, user_id, tipo)
         elif data.endswith("_mes"):
-            tipo = data.replace("ver_", "").replace("_mes", "")
+            tipo = data[len("ver_"):-len("_mes")]
             self._show_month_movements(call, user_id, tipo)
     
     def _handle_add_actions(self, call, data: str):
@@ -235,7 +258,7 @@ class CallbackHandlers:
             mensaje = self.formatter.format_menu_principal(balance_diario, resumen)
             markup = self.markup_builder.create_main_menu_markup()
             
-            self.bot.edit_message_text(
+            self._safe_edit(
                 mensaje,
                 call.message.chat.id,
                 call.message.message_id,
@@ -245,7 +268,7 @@ class CallbackHandlers:
             
         except Exception as e:
             logger.error(f"Error mostrando menú principal: {e}")
-            self.bot.edit_message_text(
+            self._safe_edit(
                 BotConstants.STATUS_MESSAGES["error"],
                 call.message.chat.id,
                 call.message.message_id
@@ -258,7 +281,7 @@ class CallbackHandlers:
             mensaje = self.formatter.format_balance(balance)
             markup = self.markup_builder.create_back_to_menu_markup()
             
-            self.bot.edit_message_text(
+            self._safe_edit(
                 mensaje,
                 call.message.chat.id,
                 call.message.message_id,
@@ -268,7 +291,7 @@ class CallbackHandlers:
             
         except Exception as e:
             logger.error(f"Error mostrando balance: {e}")
-            self.bot.edit_message_text(
+            self._safe_edit(
                 BotConstants.STATUS_MESSAGES["error"],
                 call.message.chat.id,
                 call.message.message_id
@@ -288,7 +311,7 @@ class CallbackHandlers:
             mensaje = self.formatter.format_resumen_detallado(resumen, balance_actual, resumen_anterior)
             markup = self.markup_builder.create_summary_menu_markup()
             
-            self.bot.edit_message_text(
+            self._safe_edit(
                 mensaje,
                 call.message.chat.id,
                 call.message.message_id,
@@ -298,7 +321,7 @@ class CallbackHandlers:
             
         except Exception as e:
             logger.error(f"Error mostrando resumen mensual: {e}")
-            self.bot.edit_message_text(
+            self._safe_edit(
                 BotConstants.STATUS_MESSAGES["error"],
                 call.message.chat.id,
                 call.message.message_id
@@ -311,7 +334,7 @@ class CallbackHandlers:
             mensaje = self.formatter.format_categories_by_type(tipo, categorias_con_totales)
             markup = self.markup_builder.create_categories_view_markup(tipo)
             
-            self.bot.edit_message_text(
+            self._safe_edit(
                 mensaje,
                 call.message.chat.id,
                 call.message.message_id,
@@ -321,7 +344,7 @@ class CallbackHandlers:
             
         except Exception as e:
             logger.error(f"Error mostrando categorías: {e}")
-            self.bot.edit_message_text(
+            self._safe_edit(
                 BotConstants.STATUS_MESSAGES["error"],
                 call.message.chat.id,
                 call.message.message_id
@@ -329,90 +352,11 @@ class CallbackHandlers:
     
     # ==================== MENÚS PRINCIPALES ====================
     
-    def _show_income_menu(self, call):
-        """Muestra el menú de ingresos"""
-        mensaje = self.formatter.format_movement_menu("ingreso")
-        markup = self.markup_builder.create_movement_menu_markup("ingreso")
-        
-        self.bot.edit_message_text(
-            mensaje,
-            call.message.chat.id,
-            call.message.message_id,
-            parse_mode="Markdown",
-            reply_markup=markup
-        )
-    
-    def _show_expense_menu(self, call):
-        """Muestra el menú de gastos"""
-        mensaje = self.formatter.format_movement_menu("gasto")
-        markup = self.markup_builder.create_movement_menu_markup("gasto")
-        
-        self.bot.edit_message_text(
-            mensaje,
-            call.message.chat.id,
-            call.message.message_id,
-            parse_mode="Markdown",
-            reply_markup=markup
-        )
-    
-    def _show_savings_menu(self, call):
-        """Muestra el menú de ahorros"""
-        mensaje = self.formatter.format_movement_menu("ahorro")
-        markup = self.markup_builder.create_movement_menu_markup("ahorro")
-        
-        self.bot.edit_message_text(
-            mensaje,
-            call.message.chat.id,
-            call.message.message_id,
-            parse_mode="Markdown",
-            reply_markup=markup
-        )
-    
-    def _show_subscriptions_menu(self, call):
-        """Muestra el menú de suscripciones"""
-        mensaje = self.formatter.format_subscriptions_menu()
-        markup = self.markup_builder.create_subscriptions_menu_markup()
-        
-        self.bot.edit_message_text(
-            mensaje,
-            call.message.chat.id,
-            call.message.message_id,
-            parse_mode="Markdown",
-            reply_markup=markup
-        )
-    
-    def _show_reminders_menu(self, call):
-        """Muestra el menú de recordatorios"""
-        mensaje = self.formatter.format_reminders_menu()
-        markup = self.markup_builder.create_reminders_menu_markup()
-        
-        self.bot.edit_message_text(
-            mensaje,
-            call.message.chat.id,
-            call.message.message_id,
-            parse_mode="Markdown",
-            reply_markup=markup
-        )
-    
-    def _show_debts_menu(self, call):
-        """Muestra el menú de deudas"""
-        mensaje = self.formatter.format_debts_menu()
-        markup = self.markup_builder.create_debts_menu_markup()
-        
-        self.bot.edit_message_text(
-            mensaje,
-            call.message.chat.id,
-            call.message.message_id,
-            parse_mode="Markdown",
-            reply_markup=markup
-        )
-    
-    def _show_alerts_menu(self, call):
-        """Muestra el menú de alertas"""
-        mensaje = self.formatter.format_alerts_menu()
-        markup = self.markup_builder.create_alerts_menu_markup()
+    def _static_edit(self, call, key: str):
+        """Muestra un texto fijo de la tabla _STATIC_EDITS"""
+        mensaje, markup = self._static_edits[key]
         
-        self.bot.edit_message_text(
+        self._safe_edit(
             mensaje,
             call.message.chat.id,
             call.message.message_id,
@@ -430,7 +374,7 @@ class CallbackHandlers:
             mensaje = self.formatter.format_historical_data(historico)
             markup = self.markup_builder.create_back_to_menu_markup()
             
-            self.bot.edit_message_text(
+            self._safe_edit(
                 mensaje,
                 call.message.chat.id,
                 call.message.message_id,
@@ -440,25 +384,12 @@ class CallbackHandlers:
             
         except Exception as e:
             logger.error(f"Error mostrando histórico: {e}")
-            self.bot.edit_message_text(
+            self._safe_edit(
                 BotConstants.STATUS_MESSAGES["error"],
                 call.message.chat.id,
                 call.message.message_id
             )
     
-    def _show_config_menu(self, call):
-        """Muestra el menú de configuración mejorado"""
-        mensaje = self.formatter.format_config_menu()
-        markup = self.markup_builder.create_config_menu_markup()
-        
-        self.bot.edit_message_text(
-            mensaje,
-            call.message.chat.id,
-            call.message.message_id,
-            parse_mode="Markdown",
-            reply_markup=markup
-        )
-    
     # ==================== VISUALIZACIÓN DE DATOS ====================
     
     def _show_active_debts(self, call, user_id: int):
@@ -468,7 +399,7 @@ class CallbackHandlers:
             mensaje = self.formatter.format_active_debts(deudas)
             markup = self.markup_builder.create_debts_view_markup()
             
-            self.bot.edit_message_text(
+            self._safe_edit(
                 mensaje,
                 call.message.chat.id,
                 call.message.message_id,
@@ -478,7 +409,7 @@ class CallbackHandlers:
             
         except Exception as e:
             logger.error(f"Error mostrando deudas: {e}")
-            self.bot.edit_message_text(
+            self._safe_edit(
                 BotConstants.STATUS_MESSAGES["error"],
                 call.message.chat.id,
                 call.message.message_id
@@ -498,7 +429,7 @@ class CallbackHandlers:
             
             markup = self.markup_builder.create_alerts_view_markup()
             
-            self.bot.edit_message_text(
+            self._safe_edit(
                 mensaje,
                 call.message.chat.id,
                 call.message.message_id,
@@ -508,7 +439,7 @@ class CallbackHandlers:
             
         except Exception as e:
             logger.error(f"Error mostrando alertas: {e}")
-            self.bot.edit_message_text(
+            self._safe_edit(
                 BotConstants.STATUS_MESSAGES["error"],
                 call.message.chat.id,
                 call.message.message_id
@@ -521,7 +452,7 @@ class CallbackHandlers:
             mensaje = self.formatter.format_active_subscriptions(suscripciones)
             markup = self.markup_builder.create_subscriptions_view_markup()
             
-            self.bot.edit_message_text(
+            self._safe_edit(
                 mensaje,
                 call.message.chat.id,
                 call.message.message_id,
@@ -531,7 +462,7 @@ class CallbackHandlers:
             
         except Exception as e:
             logger.error(f"Error mostrando suscripciones: {e}")
-            self.bot.edit_message_text(
+            self._safe_edit(
                 BotConstants.STATUS_MESSAGES["error"],
                 call.message.chat.id,
                 call.message.message_id
@@ -544,7 +475,7 @@ class CallbackHandlers:
             mensaje = self.formatter.format_active_reminders(recordatorios)
             markup = self.markup_builder.create_reminders_view_markup()
             
-            self.bot.edit_message_text(
+            self._safe_edit(
                 mensaje,
                 call.message.chat.id,
                 call.message.message_id,
@@ -554,7 +485,7 @@ class CallbackHandlers:
             
         except Exception as e:
             logger.error(f"Error mostrando recordatorios: {e}")
-            self.bot.edit_message_text(
+            self._safe_edit(
                 BotConstants.STATUS_MESSAGES["error"],
                 call.message.chat.id,
                 call.message.message_id
@@ -567,7 +498,7 @@ class CallbackHandlers:
             mensaje = self.formatter.format_month_movements(movimientos, tipo)
             markup = self.markup_builder.create_back_to_menu_markup()
             
-            self.bot.edit_message_text(
+            self._safe_edit(
                 mensaje,
                 call.message.chat.id,
                 call.message.message_id,
@@ -577,7 +508,7 @@ class CallbackHandlers:
             
         except Exception as e:
             logger.error(f"Error mostrando movimientos {tipo}: {e}")
-            self.bot.edit_message_text(
+            self._safe_edit(
                 BotConstants.STATUS_MESSAGES["error"],
                 call.message.chat.id,
                 call.message.message_id
@@ -593,14 +524,7 @@ class CallbackHandlers:
             
             if not categorias:
                 # Si no hay categorías, crear algunas básicas
-                if tipo == "ingreso":
-                    categorias_basicas = ["Salario", "Freelance", "Otros"]
-                elif tipo == "gasto":
-                    categorias_basicas = ["Comida", "Transporte", "Otros"]
-                else:  # ahorro
-                    categorias_basicas = ["Ahorro General", "Inversión", "Emergencia"]
-                
-                for cat in categorias_basicas:
+                for cat in _CATEGORIAS_BASICAS.get(tipo, _CATEGORIAS_BASICAS["ahorro"]):
                     self.db.agregar_categoria(cat, tipo, user_id)
                 
                 categorias = self.db.obtener_categorias(tipo, user_id)
@@ -609,7 +533,7 @@ class CallbackHandlers:
             markup = self.markup_builder.create_category_selection_markup(tipo, categorias)
             mensaje = self.formatter.format_category_selection(tipo, True)
             
-            self.bot.edit_message_text(
+            self._safe_edit(
                 mensaje,
                 call.message.chat.id,
                 call.message.message_id,
@@ -618,7 +542,7 @@ class CallbackHandlers:
             
         except Exception as e:
             logger.error(f"Error iniciando agregar {tipo}: {e}")
-            self.bot.edit_message_text(
+            self._safe_edit(
                 BotConstants.STATUS_MESSAGES["error"],
                 call.message.chat.id,
                 call.message.message_id
@@ -632,13 +556,7 @@ class CallbackHandlers:
             "message_id": call.message.message_id
         })
         
-        mensaje = self.formatter.format_subscription_name_request()
-        self.bot.edit_message_text(
-            mensaje,
-            call.message.chat.id,
-            call.message.message_id,
-            parse_mode="Markdown"
-        )
+        self._static_edit(call, "agregar_suscripcion")
     
     def _start_add_reminder(self, call, user_id: int):
         """Inicia el proceso para agregar un recordatorio"""
@@ -648,13 +566,7 @@ class CallbackHandlers:
             "message_id": call.message.message_id
         })
         
-        mensaje = self.formatter.format_reminder_description_request()
-        self.bot.edit_message_text(
-            mensaje,
-            call.message.chat.id,
-            call.message.message_id,
-            parse_mode="Markdown"
-        )
+        self._static_edit(call, "agregar_recordatorio")
     
     def _start_add_debt(self, call, user_id: int):
         """Inicia el proceso para agregar una deuda"""
@@ -664,26 +576,11 @@ class CallbackHandlers:
             "message_id": call.message.message_id
         })
         
-        mensaje = self.formatter.format_debt_name_request()
-        self.bot.edit_message_text(
-            mensaje,
-            call.message.chat.id,
-            call.message.message_id,
-            parse_mode="Markdown"
-        )
+        self._static_edit(call, "agregar_deuda")
     
     def _start_add_alert(self, call, user_id: int):
         """Inicia el proceso para agregar una alerta"""
-        mensaje = self.formatter.format_alert_type_selection()
-        markup = self.markup_builder.create_alert_type_markup()
-        
-        self.bot.edit_message_text(
-            mensaje,
-            call.message.chat.id,
-            call.message.message_id,
-            parse_mode="Markdown",
-            reply_markup=markup
-        )
+        self._static_edit(call, "agregar_alerta")
     
     # ==================== PROCESAMIENTO DE DATOS ====================
     
@@ -703,7 +600,7 @@ class CallbackHandlers:
         self._set_user_state(user_id, state)
         
         mensaje = self.formatter.format_subscription_day_request(state)
-        self.bot.edit_message_text(
+        self._safe_edit(
             mensaje,
             call.message.chat.id,
             call.message.message_id,
@@ -734,7 +631,7 @@ class CallbackHandlers:
         nombre = state.get("nombre", "") if state else ""
         mensaje = self.formatter.format_debt_amount_request(nombre)
         
-        self.bot.edit_message_text(
+        self._safe_edit(
             mensaje,
             call.message.chat.id,
             call.message.message_id,
@@ -753,7 +650,7 @@ class CallbackHandlers:
         })
         
         mensaje = self.formatter.format_alert_amount_request(tipo)
-        self.bot.edit_message_text(
+        self._safe_edit(
             mensaje,
             call.message.chat.id,
             call.message.message_id,
@@ -773,7 +670,7 @@ class CallbackHandlers:
                 "message_id": call.message.message_id
             })
             
-            self.bot.edit_message_text(
+            self._safe_edit(
                 "💰 **Cambiar Balance Inicial**\n\n"
                 "Ingresa el nuevo balance inicial:\n"
                 "**Ejemplo:** 100000 o 0",
@@ -797,7 +694,7 @@ class CallbackHandlers:
                     f"💡 **Tip:** Usa `/backup` para exportar tus datos"
                 )
                 
-                self.bot.edit_message_text(
+                self._safe_edit(
                     mensaje,
                     call.message.chat.id,
                     call.message.message_id,
@@ -806,7 +703,7 @@ class CallbackHandlers:
                 )
             except Exception as e:
                 logger.error(f"Error obteniendo estadísticas: {e}")
-                self.bot.edit_message_text(
+                self._safe_edit(
                     "❌ Error obteniendo estadísticas",
                     call.message.chat.id,
                     call.message.message_id,
@@ -815,32 +712,13 @@ class CallbackHandlers:
     
     # ==================== MÉTODOS AUXILIARES ====================
     
+    def _safe_edit(self, text: str, chat_id: int, message_id: int, **kwargs):
+        """Edita un mensaje a través del despachador con control de tasa"""
+        self.edit_dispatcher.edit(text, chat_id, message_id, **kwargs)
+    
     def _get_historical_data(self, user_id: int) -> list:
         """Obtiene datos históricos de los últimos 6 meses"""
-        try:
-            from datetime import date, timedelta
-            
-            # Calcular últimos 6 meses
-            hoy = date.today()
-            meses_historico = []
-            
-            for i in range(6):
-                if hoy.month - i > 0:
-                    mes = hoy.month - i
-                    año = hoy.year
-                else:
-                    mes = 12 + (hoy.month - i)
-                    año = hoy.year - 1
-                
-                resumen = self.db.obtener_resumen_mes(user_id, mes, año)
-                if resumen["ingresos"] > 0 or resumen["gastos"] > 0:
-                    meses_historico.append(resumen)
-            
-            return meses_historico
-            
-        except Exception as e:
-            logger.error(f"Error obteniendo datos históricos: {e}")
-            return []
+        return self.db.obtener_resumenes_meses(user_id, 6)
     
     def _set_user_state(self, user_id: int, state: dict):
         """Establece el estado del usuario con timestamp"""
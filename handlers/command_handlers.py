@@ -5,7 +5,8 @@ Handlers de comandos del bot optimizados y simplificados
 import logging
 import gc
 from config.settings import BotConstants
-from utils.message_formatter import MessageFormatter
+from utils import message_formatter
+from utils import markup_builder
 from utils.validator import InputValidator
 from utils.error_handler import handle_errors
 from typing import Optional, Dict, Any
@@ -20,8 +21,19 @@ class CommandHandlers:
         self.bot_manager: BotManager = bot_manager
         self.bot = bot_manager.bot
         self.db = bot_manager.db
-        self.formatter = MessageFormatter()
         self.validator = InputValidator()
+        
+        # Menús directos (texto y markup fijos) construidos una sola vez
+        self._menus_directos = {
+            "gasto": (
+                message_formatter.format_movement_menu("gasto"),
+                markup_builder.create_movement_menu_markup("gasto")
+            ),
+            "ingreso": (
+                message_formatter.format_movement_menu("ingreso"),
+                markup_builder.create_movement_menu_markup("ingreso")
+            ),
+        }
     
     @handle_errors
     def handle_start(self, message):
@@ -62,7 +74,7 @@ class CommandHandlers:
         
         try:
             balance = self.db.obtener_balance_actual(user_id)
-            mensaje = self.formatter.format_balance(balance)
+            mensaje = message_formatter.format_balance(balance)
             self.bot.reply_to(message, mensaje, parse_mode="Markdown")
             
         except Exception as e:
@@ -83,7 +95,7 @@ class CommandHandlers:
             if texto:
                 self._procesar_comando_rapido(message, texto, "gasto")
             else:
-                self._mostrar_menu_gastos_directo(message)
+                self._mostrar_menu_directo(message, "gasto")
                 
         except Exception as e:
             logger.error(f"Error en comando gasto: {e}")
@@ -103,7 +115,7 @@ class CommandHandlers:
             if texto:
                 self._procesar_comando_rapido(message, texto, "ingreso")
             else:
-                self._mostrar_menu_ingresos_directo(message)
+                self._mostrar_menu_directo(message, "ingreso")
                 
         except Exception as e:
             logger.error(f"Error en comando ingreso: {e}")
@@ -121,7 +133,7 @@ class CommandHandlers:
             resumen = self.db.obtener_resumen_mes(user_id)
             balance = self.db.obtener_balance_actual(user_id)
             
-            mensaje = self.formatter.format_resumen_mensual(resumen, balance)
+            mensaje = message_formatter.format_resumen_mensual(resumen, balance)
             self.bot.reply_to(message, mensaje, parse_mode="Markdown")
             
         except Exception as e:
@@ -135,7 +147,7 @@ class CommandHandlers:
     def handle_ayuda(self, message):
         """Comando /ayuda - Guía de uso ACTUALIZADA"""
         try:
-            mensaje = self.formatter.format_ayuda()
+            mensaje = message_formatter.format_ayuda()
             self.bot.reply_to(message, mensaje, parse_mode="Markdown")
             
         except Exception as e:
@@ -151,51 +163,32 @@ class CommandHandlers:
             return
         
         try:
-            import csv
-            import tempfile
-            import os
+            import io
             from datetime import datetime
             
-            # Crear archivo temporal
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv', encoding='utf-8') as f:
-                backup_path = f.name
-                
-                # Obtener datos de movimientos
-                with self.db.pool.get_connection() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute('''
-                        SELECT fecha, tipo, categoria, monto, descripcion, mes, año
-                        FROM movimientos 
-                        WHERE user_id = ?
-                        ORDER BY fecha DESC
-                    ''', (user_id,))
-                    
-                    rows = cursor.fetchall()
-                    
-                    if rows:
-                        writer = csv.writer(f)
-                        # Escribir cabeceras
-                        writer.writerow(['Fecha', 'Tipo', 'Categoria', 'Monto', 'Descripcion', 'Mes', 'Año'])
-                        # Escribir datos
-                        for row in rows:
-                            writer.writerow(row)
+            # Escribir el CSV directamente en memoria
+            buffer = io.BytesIO()
+            f = io.TextIOWrapper(buffer, encoding='utf-8', newline='')
+            total = self.db.exportar_movimientos_csv(user_id, f)
+            f.flush()
+            f.detach()
             
             # Enviar archivo si hay datos
-            if rows:
+            if total:
                 try:
-                    with open(backup_path, 'rb') as f:
-                        fecha_str = datetime.now().strftime("%Y%m%d_%H%M")
-                        filename = f"backup_finanzas_{fecha_str}.csv"
-                        
-                        self.bot.send_document(
-                            user_id,
-                            f,
-                            caption=f"📄 Backup manual - {datetime.now().strftime('%d/%m/%Y %H:%M')}\n\n"
-                                   f"📊 Total de registros: {len(rows)}",
-                            visible_file_name=filename
-                        )
-                        
-                    logger.info(f"Backup manual enviado: {len(rows)} registros")
+                    buffer.seek(0)
+                    fecha_str = datetime.now().strftime("%Y%m%d_%H%M")
+                    filename = f"backup_finanzas_{fecha_str}.csv"
+                    
+                    self.bot.send_document(
+                        user_id,
+                        buffer,
+                        caption=f"📄 Backup manual - {datetime.now().strftime('%d/%m/%Y %H:%M')}\n\n"
+                               f"📊 Total de registros: {total}",
+                        visible_file_name=filename
+                    )
+                    
+                    logger.info(f"Backup manual enviado: {total} registros")
                     
                 except Exception as e:
                     logger.error(f"Error enviando backup manual: {e}")
@@ -203,12 +196,6 @@ class CommandHandlers:
                     
             else:
                 self.bot.reply_to(message, "📄 No hay movimientos para respaldar todavía.")
-            
-            # Limpiar archivo temporal
-            try:
-                os.unlink(backup_path)
-            except:
-                pass
                 
         except Exception as e:
             logger.error(f"Error generando backup manual: {e}")
@@ -232,7 +219,7 @@ class CommandHandlers:
         # Establecer estado para balance inicial
         self._set_user_state(user_id, {"step": "balance_inicial"})
         
-        mensaje = self.formatter.format_bienvenida_configuracion()
+        mensaje = message_formatter.format_bienvenida_configuracion()
         self.bot.send_message(message.chat.id, mensaje, parse_mode="Markdown")
     
     def _continuar_configuracion_simple(self, message):
@@ -242,7 +229,7 @@ class CommandHandlers:
         # Establecer estado para balance inicial
         self._set_user_state(user_id, {"step": "balance_inicial"})
         
-        mensaje = self.formatter.format_bienvenida_configuracion()
+        mensaje = message_formatter.format_bienvenida_configuracion()
         self.bot.send_message(message.chat.id, mensaje, parse_mode="Markdown")
     
     def _mostrar_menu_principal(self, message):
@@ -255,8 +242,8 @@ class CommandHandlers:
             resumen = self.db.obtener_resumen_mes(user_id)
             
             # Crear mensaje y markup
-            mensaje = self.formatter.format_menu_principal(balance_diario, resumen)
-            markup = self.formatter.create_main_menu_markup()
+            mensaje = message_formatter.format_menu_principal(balance_diario, resumen)
+            markup = markup_builder.create_main_menu_markup()
             
             self.bot.send_message(
                 message.chat.id, 
@@ -275,15 +262,14 @@ class CommandHandlers:
         
         try:
             partes = texto.split(' ', 1)
-            monto_str = partes[0].replace(',', '').replace('$', '').strip()
             
             # Validar y convertir monto
-            if not self.validator.is_valid_amount(monto_str):
-                mensaje_error = self.formatter.format_error_comando_rapido(tipo)
+            monto = self.validator.parse_amount(partes[0])
+            if monto is None:
+                mensaje_error = message_formatter.format_error_comando_rapido(tipo)
                 self.bot.reply_to(message, mensaje_error, parse_mode="Markdown")
                 return
             
-            monto = float(monto_str)
             descripcion = partes[1] if len(partes) > 1 else ""
             
             # Obtener categoría por defecto
@@ -300,7 +286,7 @@ class CommandHandlers:
             # Registrar movimiento
             if self.db.agregar_movimiento(user_id, tipo, categoria, monto, descripcion):
                 balance = self.db.obtener_balance_actual(user_id)
-                mensaje = self.formatter.format_movimiento_registrado(
+                mensaje = message_formatter.format_movimiento_registrado(
                     tipo, categoria, monto, descripcion, balance
                 )
                 self.bot.reply_to(message, mensaje, parse_mode="Markdown")
@@ -309,43 +295,12 @@ class CommandHandlers:
                 
         except Exception as e:
             logger.error(f"Error procesando comando rápido {tipo}: {e}")
-            mensaje_error = self.formatter.format_error_comando_rapido(tipo)
+            mensaje_error = message_formatter.format_error_comando_rapido(tipo)
             self.bot.reply_to(message, mensaje_error, parse_mode="Markdown")
     
-    def _mostrar_menu_gastos_directo(self, message):
-        """Muestra menú de gastos directamente"""
-        from utils.markup_builder import MarkupBuilder
-        
-        markup = MarkupBuilder.create_movement_menu_markup("gasto")
-        mensaje = self.formatter.format_movement_menu("gasto")
-        
-        self.bot.reply_to(
-            message, 
-            mensaje, 
-            reply_markup=markup, 
-            parse_mode="Markdown"
-        )
-    
-    def _mostrar_menu_ingresos_directo(self, message):
-        """Muestra menú de ingresos directamente"""
-        from utils.markup_builder import MarkupBuilder
-        
-        markup = MarkupBuilder.create_movement_menu_markup("ingreso")
-        mensaje = self.formatter.format_movement_menu("ingreso")
-        
-        self.bot.reply_to(
-            message, 
-            mensaje, 
-            reply_markup=markup, 
-            parse_mode="Markdown"
-        )
-    
-    def _mostrar_menu_configuracion_directo(self, message):
-        """Muestra menú de configuración directamente"""
-        from utils.markup_builder import MarkupBuilder
-        
-        markup = MarkupBuilder.create_config_menu_markup()
-        mensaje = self.formatter.format_config_menu()
+    def _mostrar_menu_directo(self, message, clave: str):
+        """Muestra un menú fijo (gastos, ingresos o configuración) directamente"""
+        mensaje, markup = self._menus_directos[clave]
         
         self.bot.reply_to(
             message, 
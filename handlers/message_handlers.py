@@ -5,13 +5,17 @@ Handlers de mensajes de texto optimizados con nuevas funcionalidades
 import logging
 import gc
 from config.settings import BotConstants
-from utils.message_formatter import MessageFormatter
-from utils.markup_builder import MarkupBuilder
+from utils import message_formatter
+from utils import markup_builder
 from utils.validator import InputValidator
 from utils.error_handler import handle_errors
 
 logger = logging.getLogger(__name__)
 
+# Tablas por tipo de movimiento (se construyen una sola vez al importar)
+_EMOJI_BY_TIPO = BotConstants.MOVEMENT_EMOJIS
+_CATEGORIAS_SUSCRIPCION = ("Servicios", "Entretenimiento", "Otros")
+
 class MessageHandlers:
     """Gestiona todos los mensajes de texto del bot"""
     
@@ -20,9 +24,37 @@ class MessageHandlers:
         self.bot_manager: BotManager = bot_manager
         self.bot = bot_manager.bot
         self.db = bot_manager.db
-        self.formatter = MessageFormatter()
-        self.markup_builder = MarkupBuilder()
+        self.formatter = message_formatter
+        self.markup_builder = markup_builder
         self.validator = InputValidator()
+        
+        # Despacho de pasos: step -> método que procesa el mensaje
+        self._step_handlers = {
+            "balance_inicial": self._process_initial_balance,
+            "descripcion_movimiento": self._process_movement_description,
+            "config_nuevo_balance": self._process_new_initial_balance,
+            
+            # Suscripciones
+            "suscripcion_nombre": self._process_subscription_name,
+            "suscripcion_monto": self._process_subscription_amount,
+            "suscripcion_dia": self._process_subscription_day,
+            
+            # Recordatorios
+            "recordatorio_descripcion": self._process_reminder_description,
+            "recordatorio_fecha": self._process_reminder_date,
+            
+            # Deudas
+            "deuda_nombre": self._process_debt_name,
+            "deuda_monto": self._process_debt_amount,
+            
+            # Alertas
+            "alerta_monto": self._process_alert_amount,
+        }
+        
+        # Pasos por tipo de movimiento
+        for tipo in BotConstants.MOVEMENT_TYPES:
+            self._step_handlers[f"monto_{tipo}"] = self._process_amount_input
+            self._step_handlers[f"nueva_categoria_{tipo}"] = self._process_new_category
     
     @handle_errors
     def handle_text_input(self, message):
@@ -44,43 +76,10 @@ class MessageHandlers:
             
             # Procesar según el paso actual
             step = state.get("step", "")
+            handler = self._step_handlers.get(step)
             
-            # Estados existentes
-            if step == "balance_inicial":
-                self._process_initial_balance(message, state)
-            elif step.startswith("nueva_categoria_"):
-                self._process_new_category(message, state)
-            elif step.startswith("monto_"):
-                self._process_amount_input(message, state)
-            elif step == "descripcion_movimiento":
-                self._process_movement_description(message, state)
-            elif step == "config_nuevo_balance":
-                self._process_new_initial_balance(message, state)
-            
-            # Estados de suscripciones
-            elif step == "suscripcion_nombre":
-                self._process_subscription_name(message, state)
-            elif step == "suscripcion_monto":
-                self._process_subscription_amount(message, state)
-            elif step == "suscripcion_dia":
-                self._process_subscription_day(message, state)
-            
-            # Estados de recordatorios
-            elif step == "recordatorio_descripcion":
-                self._process_reminder_description(message, state)
-            elif step == "recordatorio_fecha":
-                self._process_reminder_date(message, state)
-            
-            # Estados de deudas (NUEVO)
-            elif step == "deuda_nombre":
-                self._process_debt_name(message, state)
-            elif step == "deuda_monto":
-                self._process_debt_amount(message, state)
-            
-            # Estados de alertas (NUEVO)
-            elif step == "alerta_monto":
-                self._process_alert_amount(message, state)
-            
+            if handler:
+                handler(message, state)
             else:
                 logger.warning(f"Paso no reconocido: {step}")
                 self._send_help_message(message)
@@ -97,47 +96,36 @@ class MessageHandlers:
         user_id = message.from_user.id
         text = message.text.strip()
         
-        try:
-            # Limpiar y validar entrada
-            balance_str = text.replace(",", "").replace("$", "").strip()
-            
-            if not self.validator.is_valid_amount(balance_str, allow_zero=True):
-                self.bot.reply_to(
-                    message,
-                    f"{BotConstants.ERROR} Por favor ingresa un número válido.\n"
-                    "**Ejemplo:** 100000 o 0 si empiezas desde cero"
-                )
-                return
-            
-            balance = float(balance_str)
-            
-            # Actualizar balance en base de datos
-            if self.db.actualizar_balance_inicial(user_id, balance):
-                # Limpiar estado
-                self.bot_manager.clear_user_state(user_id)
-                
-                # Marcar como configurado directamente (sin categorías por defecto)
-                self.db.marcar_usuario_configurado(user_id)
-                
-                self.bot.reply_to(
-                    message,
-                    f"{BotConstants.SUCCESS} **¡Configuración Completada!**\n\n"
-                    f"💰 Balance inicial: ${balance:,.2f}\n\n"
-                    f"✨ Ya puedes usar todas las funciones del bot.\n"
-                    f"Envía /start para ver el menú principal"
-                )
-            else:
-                self.bot.reply_to(
-                    message,
-                    f"{BotConstants.ERROR} Error guardando el balance. Intenta de nuevo."
-                )
-            
-        except ValueError:
+        balance = self.validator.parse_amount(text, allow_zero=True)
+        
+        if balance is None:
             self.bot.reply_to(
                 message,
                 f"{BotConstants.ERROR} Por favor ingresa un número válido.\n"
                 "**Ejemplo:** 100000 o 0 si empiezas desde cero"
             )
+            return
+        
+        # Actualizar balance en base de datos
+        if self.db.actualizar_balance_inicial(user_id, balance):
+            # Limpiar estado
+            self.bot_manager.clear_user_state(user_id)
+            
+            # Marcar como configurado directamente (sin categorías por defecto)
+            self.db.marcar_usuario_configurado(user_id)
+            
+            self.bot.reply_to(
+                message,
+                f"{BotConstants.SUCCESS} **¡Configuración Completada!**\n\n"
+                f"💰 Balance inicial: ${balance:,.2f}\n\n"
+                f"✨ Ya puedes usar todas las funciones del bot.\n"
+                f"Envía /start para ver el menú principal"
+            )
+        else:
+            self.bot.reply_to(
+                message,
+                f"{BotConstants.ERROR} Error guardando el balance. Intenta de nuevo."
+            )
     
     def _process_new_category(self, message, state: dict):
         """Procesa una nueva categoría personalizada"""
@@ -170,7 +158,7 @@ class MessageHandlers:
             self.bot_manager.clear_user_state(user_id)
             
             # Iniciar proceso de agregar movimiento con la nueva categoría
-            emoji = BotConstants.INCOME if tipo == "ingreso" else BotConstants.EXPENSE if tipo == "gasto" else "💳"
+            emoji = _EMOJI_BY_TIPO.get(tipo, BotConstants.MONEY)
             
             # Establecer estado para pedir monto
             self._set_user_state(user_id, {
@@ -192,39 +180,28 @@ class MessageHandlers:
         user_id = message.from_user.id
         text = message.text.strip()
         
-        try:
-            # Limpiar y validar monto
-            monto_str = text.replace(",", "").replace("$", "").strip()
-            
-            if not self.validator.is_valid_amount(monto_str):
-                self.bot.reply_to(
-                    message,
-                    f"{BotConstants.ERROR} Por favor ingresa un número válido mayor a 0.\n"
-                    "**Ejemplo:** 50000 o 25.50"
-                )
-                return
-            
-            monto = float(monto_str)
-            
-            # Actualizar estado
-            state["monto"] = monto
-            state["step"] = "descripcion_movimiento"
-            self._set_user_state(user_id, state)
-            
-            # Solicitar descripción
-            tipo = state.get("tipo", "")
-            categoria = state.get("categoria", "")
-            emoji = self._get_movement_emoji(tipo)
-            
-            mensaje = self.formatter.format_description_request(tipo, categoria, monto, emoji)
-            self.bot.send_message(message.chat.id, mensaje, parse_mode="Markdown")
-            
-        except ValueError:
+        monto = self.validator.parse_amount(text)
+        
+        if monto is None:
             self.bot.reply_to(
                 message,
                 f"{BotConstants.ERROR} Por favor ingresa un número válido mayor a 0.\n"
                 "**Ejemplo:** 50000 o 25.50"
             )
+            return
+        
+        # Actualizar estado
+        state["monto"] = monto
+        state["step"] = "descripcion_movimiento"
+        self._set_user_state(user_id, state)
+        
+        # Solicitar descripción
+        tipo = state.get("tipo", "")
+        categoria = state.get("categoria", "")
+        emoji = self._get_movement_emoji(tipo)
+        
+        mensaje = self.formatter.format_description_request(tipo, categoria, monto, emoji)
+        self.bot.send_message(message.chat.id, mensaje, parse_mode="Markdown")
     
     def _process_movement_description(self, message, state: dict):
         """Procesa la descripción de un movimiento y lo guarda"""
@@ -286,41 +263,30 @@ class MessageHandlers:
         user_id = message.from_user.id
         text = message.text.strip()
         
-        try:
-            # Limpiar y validar entrada
-            balance_str = text.replace(",", "").replace("$", "").strip()
-            
-            if not self.validator.is_valid_amount(balance_str, allow_zero=True):
-                self.bot.reply_to(
-                    message,
-                    f"{BotConstants.ERROR} Por favor ingresa un número válido.\n"
-                    "**Ejemplo:** 100000 o 0"
-                )
-                return
-            
-            balance = float(balance_str)
-            
-            # Actualizar balance en base de datos
-            if self.db.actualizar_balance_inicial(user_id, balance):
-                self.bot_manager.clear_user_state(user_id)
-                
-                self.bot.reply_to(
-                    message,
-                    f"{BotConstants.SUCCESS} **Balance inicial actualizado**\n\n"
-                    f"💰 Nuevo balance inicial: ${balance:,.2f}"
-                )
-            else:
-                self.bot.reply_to(
-                    message,
-                    f"{BotConstants.ERROR} Error actualizando el balance. Intenta de nuevo."
-                )
-            
-        except ValueError:
+        balance = self.validator.parse_amount(text, allow_zero=True)
+        
+        if balance is None:
             self.bot.reply_to(
                 message,
                 f"{BotConstants.ERROR} Por favor ingresa un número válido.\n"
                 "**Ejemplo:** 100000 o 0"
             )
+            return
+        
+        # Actualizar balance en base de datos
+        if self.db.actualizar_balance_inicial(user_id, balance):
+            self.bot_manager.clear_user_state(user_id)
+            
+            self.bot.reply_to(
+                message,
+                f"{BotConstants.SUCCESS} **Balance inicial actualizado**\n\n"
+                f"💰 Nuevo balance inicial: ${balance:,.2f}"
+            )
+        else:
+            self.bot.reply_to(
+                message,
+                f"{BotConstants.ERROR} Error actualizando el balance. Intenta de nuevo."
+            )
     
     # ==================== SUSCRIPCIONES ====================
     
@@ -349,104 +315,86 @@ class MessageHandlers:
         user_id = message.from_user.id
         text = message.text.strip()
         
-        try:
-            monto_str = text.replace(",", "").replace("$", "").strip()
-            
-            if not self.validator.is_valid_amount(monto_str):
-                self.bot.reply_to(
-                    message,
-                    f"{BotConstants.ERROR} Por favor ingresa un número válido mayor a 0.\n"
-                    "**Ejemplo:** 15000 o 9.99"
-                )
-                return
-            
-            monto = float(monto_str)
-            
-            # Actualizar estado
-            state["monto"] = monto
-            state["step"] = "suscripcion_categoria"
-            self._set_user_state(user_id, state)
-            
-            # Mostrar categorías de gasto para seleccionar
-            categorias = self.db.obtener_categorias("gasto", user_id)
-            
-            if not categorias:
-                # Crear categorías básicas de gasto si no existen
-                categorias_basicas = ["Servicios", "Entretenimiento", "Otros"]
-                for cat in categorias_basicas:
-                    self.db.agregar_categoria(cat, "gasto", user_id)
-                categorias = self.db.obtener_categorias("gasto", user_id)
-            
-            markup = self.markup_builder.create_subscription_category_markup(categorias)
-            mensaje = self.formatter.format_subscription_category_selection(state)
-            
-            self.bot.send_message(
-                message.chat.id,
-                mensaje,
-                parse_mode="Markdown",
-                reply_markup=markup
-            )
-            
-        except ValueError:
+        monto = self.validator.parse_amount(text)
+        
+        if monto is None:
             self.bot.reply_to(
                 message,
                 f"{BotConstants.ERROR} Por favor ingresa un número válido mayor a 0.\n"
                 "**Ejemplo:** 15000 o 9.99"
             )
+            return
+        
+        # Actualizar estado
+        state["monto"] = monto
+        state["step"] = "suscripcion_categoria"
+        self._set_user_state(user_id, state)
+        
+        # Mostrar categorías de gasto para seleccionar
+        categorias = self.db.obtener_categorias("gasto", user_id)
+        
+        if not categorias:
+            # Crear categorías básicas de gasto si no existen
+            for cat in _CATEGORIAS_SUSCRIPCION:
+                self.db.agregar_categoria(cat, "gasto", user_id)
+            categorias = self.db.obtener_categorias("gasto", user_id)
+        
+        markup = self.markup_builder.create_subscription_category_markup(categorias)
+        mensaje = self.formatter.format_subscription_category_selection(state)
+        
+        self.bot.send_message(
+            message.chat.id,
+            mensaje,
+            parse_mode="Markdown",
+            reply_markup=markup
+        )
     
     def _process_subscription_day(self, message, state: dict):
         """Procesa el día de cobro de una suscripción"""
         user_id = message.from_user.id
         text = message.text.strip()
         
-        try:
-            dia = int(text)
-            
-            if not (1 <= dia <= 31):
-                self.bot.reply_to(
-                    message,
-                    f"{BotConstants.ERROR} Por favor ingresa un día válido entre 1 y 31."
-                )
-                return
-            
-            # Obtener datos del estado
-            nombre = state.get("nombre", "")
-            monto = state.get("monto", 0)
-            categoria = state.get("categoria", "")
-            
-            # Validar que tenemos todos los datos
-            if not nombre or not monto or not categoria:
-                logger.error(f"Datos incompletos para suscripción: {state}")
-                self.bot_manager.clear_user_state(user_id)
-                self.bot.reply_to(message, BotConstants.STATUS_MESSAGES["error"])
-                return
-            
-            # Guardar la suscripción
-            if self.db.agregar_suscripcion(user_id, nombre, monto, categoria, dia):
-                mensaje = self.formatter.format_subscription_success(nombre, monto, categoria, dia)
-                markup = self.markup_builder.create_subscription_success_markup()
-                
-                self.bot.send_message(
-                    message.chat.id,
-                    mensaje,
-                    parse_mode="Markdown",
-                    reply_markup=markup
-                )
-            else:
-                self.bot.reply_to(
-                    message, 
-                    f"{BotConstants.ERROR} Error guardando la suscripción. Intenta de nuevo."
-                )
-            
-            # Limpiar estado
-            self.bot_manager.clear_user_state(user_id)
-            
-        except ValueError:
+        dia = self.validator.parse_day(text)
+        
+        if dia is None:
             self.bot.reply_to(
                 message,
                 f"{BotConstants.ERROR} Por favor ingresa un número válido entre 1 y 31.\n"
                 "**Ejemplo:** 15 (para el día 15 de cada mes)"
             )
+            return
+        
+        # Obtener datos del estado
+        nombre = state.get("nombre", "")
+        monto = state.get("monto", 0)
+        categoria = state.get("categoria", "")
+        
+        # Validar que tenemos todos los datos
+        if not nombre or not monto or not categoria:
+            logger.error(f"Datos incompletos para suscripción: {state}")
+            self.bot_manager.clear_user_state(user_id)
+            self.bot.reply_to(message, BotConstants.STATUS_MESSAGES["error"])
+            return
+        
+        # Guardar la suscripción
+        if self.db.agregar_suscripcion(user_id, nombre, monto, categoria, dia):
+            mensaje = self.formatter.format_subscription_success(nombre, monto, categoria, dia)
+            markup = self.markup_builder.create_subscription_success_markup()
+            
+            self.bot.send_message(
+                message.chat.id,
+                mensaje,
+                parse_mode="Markdown",
+                reply_markup=markup
+            )
+        else:
+            self.bot.reply_to(
+                message, 
+                f"{BotConstants.ERROR} Error guardando la suscripción. Intenta de nuevo."
+            )
+        
+        # Limpiar estado
+        self.bot_manager.clear_user_state(user_id)
     
     # ==================== RECORDATORIOS ====================
     
@@ -560,101 +508,37 @@ class MessageHandlers:
         user_id = message.from_user.id
         text = message.text.strip()
         
-        try:
-            # Limpiar entrada y validar
-            monto_str = text.replace(",", "").replace("$", "").replace("-", "").strip()
-            
-            if not self.validator.is_valid_amount(monto_str):
-                self.bot.reply_to(
-                    message,
-                    f"{BotConstants.ERROR} Por favor ingresa un número válido mayor a 0.\n"
-                    "**Ejemplo:** 50000 o 25000.50"
-                )
-                return
-            
-            monto = float(monto_str)
-            nombre = state.get("nombre", "")
-            tipo = state.get("tipo", "")
-            
-            # Validar datos
-            if not nombre or not tipo:
-                logger.error(f"Datos incompletos para deuda: {state}")
-                self.bot_manager.clear_user_state(user_id)
-                self.bot.reply_to(message, BotConstants.STATUS_MESSAGES["error"])
-                return
-            
-            # Guardar deuda - EL SISTEMA maneja el signo automáticamente
-            try:
-                if self.db.agregar_deuda(user_id, nombre, monto, tipo):
-                    tipo_texto = "Te deben" if tipo == "positiva" else "Tú debes"
-                    mensaje = (
-                        f"{BotConstants.SUCCESS} **Deuda Registrada**\n\n"
-                        f"💰 **{nombre}** {tipo_texto.lower()}\n"
-                        f"{BotConstants.MONEY} ${monto:,.2f}\n\n"
-                        f"✅ Registrada correctamente"
-                    )
-                    markup = self.markup_builder.create_debt_success_markup()
-                    
-                    self.bot.send_message(
-                        message.chat.id,
-                        mensaje,
-                        parse_mode="Markdown",
-                        reply_markup=markup
-                    )
-                else:
-                    self.bot.reply_to(
-                        message, 
-                        f"{BotConstants.ERROR} Error guardando la deuda. Intenta de nuevo."
-                    )
-            except Exception as e:
-                logger.error(f"Error específico guardando deuda: {e}")
-                self.bot.reply_to(
-                    message,
-                    f"{BotConstants.ERROR} Error en la base de datos. Intenta más tarde."
-                )
-            
-            # Limpiar estado
-            self.bot_manager.clear_user_state(user_id)
-            
-        except ValueError:
+        monto = self.validator.parse_amount(text.replace("-", ""))
+        
+        if monto is None:
             self.bot.reply_to(
                 message,
                 f"{BotConstants.ERROR} Por favor ingresa un número válido mayor a 0.\n"
                 "**Ejemplo:** 50000 o 25000.50"
             )
-    
-    # ==================== ALERTAS (NUEVO) ====================
-    
-    def _process_alert_amount(self, message, state: dict):
-        """Procesa el monto límite de una alerta"""
-        user_id = message.from_user.id
-        text = message.text.strip()
+            return
         
+        nombre = state.get("nombre", "")
+        tipo = state.get("tipo", "")
+        
+        # Validar datos
+        if not nombre or not tipo:
+            logger.error(f"Datos incompletos para deuda: {state}")
+            self.bot_manager.clear_user_state(user_id)
+            self.bot.reply_to(message, BotConstants.STATUS_MESSAGES["error"])
+            return
+        
+        # Guardar deuda - EL SISTEMA maneja el signo automáticamente
         try:
-            monto_str = text.replace(",", "").replace("$", "").strip()
-            
-            if not self.validator.is_valid_amount(monto_str):
-                self.bot.reply_to(
-                    message,
-                    f"{BotConstants.ERROR} Por favor ingresa un número válido mayor a 0.\n"
-                    "**Ejemplo:** 50000 (para límite de ${50000:,.2f})"
+            if self.db.agregar_deuda(user_id, nombre, monto, tipo):
+                tipo_texto = "Te deben" if tipo == "positiva" else "Tú debes"
+                mensaje = (
+                    f"{BotConstants.SUCCESS} **Deuda Registrada**\n\n"
+                    f"💰 **{nombre}** {tipo_texto.lower()}\n"
+                    f"{BotConstants.MONEY} ${monto:,.2f}\n\n"
+                    f"✅ Registrada correctamente"
                 )
-                return
-            
-            limite = float(monto_str)
-            tipo = state.get("tipo", "")
-            
-            # Validar tipo
-            if tipo not in BotConstants.ALERT_TYPES:
-                logger.error(f"Tipo de alerta inválido: {tipo}")
-                self.bot_manager.clear_user_state(user_id)
-                self.bot.reply_to(message, BotConstants.STATUS_MESSAGES["error"])
-                return
-            
-            # Guardar alerta
-            if self.db.agregar_alerta(user_id, tipo, limite):
-                mensaje = self.formatter.format_alert_success(tipo, limite)
-                markup = self.markup_builder.create_alert_success_markup()
+                markup = self.markup_builder.create_debt_success_markup()
                 
                 self.bot.send_message(
                     message.chat.id,
@@ -665,18 +549,63 @@ class MessageHandlers:
             else:
                 self.bot.reply_to(
                     message, 
-                    f"{BotConstants.ERROR} Error guardando la alerta. Intenta de nuevo."
+                    f"{BotConstants.ERROR} Error guardando la deuda. Intenta de nuevo."
                 )
-            
-            # Limpiar estado
-            self.bot_manager.clear_user_state(user_id)
-            
-        except ValueError:
+        except Exception as e:
+            logger.error(f"Error específico guardando deuda: {e}")
+            self.bot.reply_to(
+                message,
+                f"{BotConstants.ERROR} Error en la base de datos. Intenta más tarde."
+            )
+        
+        # Limpiar estado
+        self.bot_manager.clear_user_state(user_id)
+    
+    # ==================== ALERTAS (NUEVO) ====================
+    
+    def _process_alert_amount(self, message, state: dict):
+        """Procesa el monto límite de una alerta"""
+        user_id = message.from_user.id
+        text = message.text.strip()
+        
+        limite = self.validator.parse_amount(text)
+        
+        if limite is None:
             self.bot.reply_to(
                 message,
                 f"{BotConstants.ERROR} Por favor ingresa un número válido mayor a 0.\n"
                 "**Ejemplo:** 50000 (para límite de ${50000:,.2f})"
             )
+            return
+        
+        tipo = state.get("tipo", "")
+        
+        # Validar tipo
+        if tipo not in BotConstants.ALERT_TYPES:
+            logger.error(f"Tipo de alerta inválido: {tipo}")
+            self.bot_manager.clear_user_state(user_id)
+            self.bot.reply_to(message, BotConstants.STATUS_MESSAGES["error"])
+            return
+        
+        # Guardar alerta
+        if self.db.agregar_alerta(user_id, tipo, limite):
+            mensaje = self.formatter.format_alert_success(tipo, limite)
+            markup = self.markup_builder.create_alert_success_markup()
+            
+            self.bot.send_message(
+                message.chat.id,
+                mensaje,
+                parse_mode="Markdown",
+                reply_markup=markup
+            )
+        else:
+            self.bot.reply_to(
+                message, 
+                f"{BotConstants.ERROR} Error guardando la alerta. Intenta de nuevo."
+            )
+        
+        # Limpiar estado
+        self.bot_manager.clear_user_state(user_id)
     
     # ==================== MÉTODOS AUXILIARES ====================
     
@@ -690,12 +619,7 @@ class MessageHandlers:
     
     def _get_movement_emoji(self, tipo: str) -> str:
         """Retorna el emoji correspondiente al tipo de movimiento"""
-        emoji_map = {
-            "ingreso": BotConstants.INCOME,
-            "gasto": BotConstants.EXPENSE,
-            "ahorro": "💳"
-        }
-        return emoji_map.get(tipo, BotConstants.MONEY)
+        return _EMOJI_BY_TIPO.get(tipo, BotConstants.MONEY)
     
     def _set_user_state(self, user_id: int, state: dict):
         """Establece el estado del usuario con timestamp"""
@@ -76,6 +76,12 @@ class FinanceBot:
             # Iniciar monitor de salud
             self.health_checker.start_monitoring()
             
+            # Congelar los objetos de arranque para que el GC no los recorra
+            self.memory_manager.optimize_collections()
+            
+            # Iniciar monitor de memoria (una sola instancia para todo el proceso)
+            self.memory_manager.start_monitoring()
+            
             logger.info("🤖 Bot inicializado correctamente")
             return True
             
@@ -117,6 +123,7 @@ class FinanceBot:
                 self.bot_manager.shutdown()
             
             self.health_checker.stop_monitoring()
+            self.memory_manager.stop_monitoring()
             self.memory_manager.cleanup_all()
             
             logger.info("🔄 Shutdown completado")
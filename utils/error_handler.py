@@ -22,9 +22,6 @@ def handle_errors(func: Callable) -> Callable:
             logger.error(f"Error en {func.__name__}: {str(e)}")
             logger.error(f"Traceback: {traceback.format_exc()}")
             
-            # Limpiar memoria en caso de error
-            gc.collect()
-            
             # Si es un método de handler, intentar enviar mensaje de error
             if hasattr(args[0], 'bot') and len(args) > 1:
                 try:
@@ -32,7 +29,10 @@ def handle_errors(func: Callable) -> Callable:
                     message_or_call = args[1]
                     
                     if hasattr(message_or_call, 'message'):  # Es callback
-                        handler_self.bot.edit_message_text(
+                        # Pasar por el despachador para no desordenarse con sus ediciones pendientes
+                        dispatcher = getattr(handler_self, 'edit_dispatcher', None)
+                        edit = dispatcher.edit if dispatcher else handler_self.bot.edit_message_text
+                        edit(
                             "❌ Error procesando la solicitud. Intenta de nuevo.",
                             message_or_call.message.chat.id,
                             message_or_call.message.message_id
@@ -34,6 +34,11 @@ class HealthChecker:
         self.cpu_warning_threshold = 80  # %
         self.uptime_restart_suggestion = 24 * 60 * 60  # 24 horas
         
+        # Proceso reutilizable; la primera lectura de CPU fija la línea base
+        self._process = psutil.Process(os.getpid())
+        self._process.cpu_percent(None)
+        self._last_stats_log = time.monotonic()
+        
     def start_monitoring(self):
         """Inicia el monitoreo de salud"""
         if self.monitoring:
@@ -64,13 +69,11 @@ class HealthChecker:
     def _check_system_health(self):
         """Verifica la salud del sistema"""
         try:
-            # Actualizar estadísticas
-            process = psutil.Process(os.getpid())
-            
+            # Actualizar estadísticas (CPU promedio desde la verificación anterior)
             self.health_stats.update({
                 'uptime': (datetime.now() - self.start_time).total_seconds(),
-                'memory_usage': process.memory_percent(),
-                'cpu_usage': process.cpu_percent(interval=1),
+                'memory_usage': self._process.memory_percent(),
+                'cpu_usage': self._process.cpu_percent(None),
                 'last_check': datetime.now()
             })
             
@@ -80,8 +83,10 @@ class HealthChecker:
             self._check_uptime()
             
             # Log estadísticas cada hora
-            if int(time.time()) % 3600 == 0:
+            now = time.monotonic()
+            if now - self._last_stats_log >= 3600:
                 self._log_health_stats()
+                self._last_stats_log = now
                 
         except Exception as e:
             logger.error(f"Error verificando salud del sistema: {e}")
@@ -94,9 +99,9 @@ class HealthChecker:
             logger.critical(f"Memoria crítica: {memory_percent:.1f}%")
             self.health_stats['alerts_sent'] += 1
             
-            # Forzar limpieza de memoria
+            # Forzar limpieza de memoria (generaciones jóvenes, sin recorrer todo el heap)
             import gc
-            collected = gc.collect()
+            collected = gc.collect(1)
             logger.info(f"Limpieza forzada: {collected} objetos recolectados")
             
         elif memory_percent > self.memory_warning_threshold:
@@ -131,8 +136,7 @@ class HealthChecker:
     def get_health_report(self) -> Dict[str, Any]:
         """Obtiene reporte completo de salud"""
         try:
-            process = psutil.Process(os.getpid())
-            memory_info = process.memory_info()
+            memory_info = self._process.memory_info()
             
             return {
                 'status': self._get_overall_status(),
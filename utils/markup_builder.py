@@ -1,331 +1,322 @@
 """
 Constructor de markups de botones inline optimizado
+
+Los builders son funciones de módulo; se usan como `markup_builder.create_*()`.
 """
 
-from typing import List
+import json
+from functools import wraps
+from typing import Dict, List
 from telebot.types import InlineKeyboardMarkup, InlineKeyboardButton
 from config.settings import BotConstants
 
-class MarkupBuilder:
-    """Clase para construir todos los markups de botones de forma consistente"""
+class _PreSerializedMarkup(InlineKeyboardMarkup):
+    """Markup compartido que serializa su JSON una sola vez"""
+    
+    def __init__(self, markup: InlineKeyboardMarkup):
+        super().__init__(keyboard=markup.keyboard, row_width=markup.row_width)
+        self._json = json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":"))
+    
+    def to_json(self) -> str:
+        # telebot llama a to_json() en cada envío; el contenido nunca cambia
+        return self._json
+
+# Markups ya construidos; telebot solo los lee al serializar, así que se comparten
+_STATIC_MARKUP_CACHE: Dict[tuple, InlineKeyboardMarkup] = {}
+
+def _cached_markup(fn):
+    """Construye el markup una sola vez por combinación de argumentos"""
+    name = fn.__name__
     
-    @staticmethod
-    def create_main_menu_markup() -> InlineKeyboardMarkup:
-        """Crea el markup del menú principal con mejor distribución"""
-        markup = InlineKeyboardMarkup(row_width=2)
-        
+    @wraps(fn)
+    def wrapper(*args):
+        key = (name,) + args
+        markup = _STATIC_MARKUP_CACHE.get(key)
+        if markup is None:
+            markup = _STATIC_MARKUP_CACHE[key] = _PreSerializedMarkup(fn(*args))
+        return markup
+    
+    return wrapper
+
+# Etiquetas fijas, formateadas una sola vez al importar
+_LBL_HOME = f"{BotConstants.HOME} Menú Principal"
+_LBL_BALANCE = f"{BotConstants.MONEY} Balance"
+_LBL_RESUMEN = f"{BotConstants.CHART} Resumen"
+_LBL_INGRESOS = f"{BotConstants.INCOME} Ingresos"
+_LBL_GASTOS = f"{BotConstants.EXPENSE} Gastos"
+_LBL_CONFIGURAR = f"{BotConstants.SETTINGS} Configurar"
+
+# Etiquetas y callback_data por tipo de movimiento
+_LBL_AGREGAR = {t: f"Agregar {t.title()}" for t in BotConstants.MOVEMENT_TYPES}
+_LBL_AGREGAR_OTRO = {t: f"Agregar Otro {t.title()}" for t in BotConstants.MOVEMENT_TYPES}
+_LBL_VER_MES = {t: f"Ver {t.title()}s del Mes" for t in BotConstants.MOVEMENT_TYPES}
+_CB_AGREGAR = {t: f"agregar_{t}" for t in BotConstants.MOVEMENT_TYPES}
+_CB_VER_MES = {t: f"ver_{t}s_mes" for t in BotConstants.MOVEMENT_TYPES}
+_CB_VER_CATEGORIAS = {t: f"ver_categorias_{t}" for t in BotConstants.MOVEMENT_TYPES}
+_CB_NUEVA_CATEGORIA = {t: f"nueva_categoria_{t}" for t in BotConstants.MOVEMENT_TYPES}
+_CB_SELECT_CAT = {t: f"select_cat_{t}_" for t in BotConstants.MOVEMENT_TYPES}
+_EMOJI_POR_TIPO = BotConstants.MOVEMENT_EMOJIS
+
+# Botones repetidos en varios markups; telebot solo los lee, así que se comparten
+_BTN_HOME = InlineKeyboardButton(_LBL_HOME, callback_data="back_to_menu")
+_BTN_CANCEL = InlineKeyboardButton("❌ Cancelar", callback_data="back_to_menu")
+_BTN_NUEVA_SUSCRIPCION = InlineKeyboardButton("🔄 Nueva Suscripción", callback_data="agregar_suscripcion")
+_BTN_VER_SUSCRIPCIONES = InlineKeyboardButton("📋 Ver Suscripciones", callback_data="ver_suscripciones")
+_BTN_NUEVO_RECORDATORIO = InlineKeyboardButton("🔔 Nuevo Recordatorio", callback_data="agregar_recordatorio")
+_BTN_VER_RECORDATORIOS = InlineKeyboardButton("📋 Ver Recordatorios", callback_data="ver_recordatorios")
+_BTN_NUEVA_DEUDA = InlineKeyboardButton("💰 Nueva Deuda", callback_data="agregar_deuda")
+_BTN_VER_DEUDAS = InlineKeyboardButton("📋 Ver Deudas", callback_data="ver_deudas")
+_BTN_NUEVA_ALERTA = InlineKeyboardButton("🚨 Nueva Alerta", callback_data="agregar_alerta")
+_BTN_VER_ALERTAS = InlineKeyboardButton("📋 Ver Alertas", callback_data="ver_alertas")
+_BTN_NUEVA_CATEGORIA = {
+    t: InlineKeyboardButton("✨ Nueva Categoría", callback_data=_CB_NUEVA_CATEGORIA[t])
+    for t in BotConstants.MOVEMENT_TYPES
+}
+_BTN_AGREGAR = {
+    t: InlineKeyboardButton(_LBL_AGREGAR[t], callback_data=_CB_AGREGAR[t])
+    for t in BotConstants.MOVEMENT_TYPES
+}
+
+# ==================== MENÚ PRINCIPAL Y MOVIMIENTOS ====================
+
+@_cached_markup
+def create_main_menu_markup() -> InlineKeyboardMarkup:
+    """Crea el markup del menú principal con mejor distribución"""
+    return InlineKeyboardMarkup(keyboard=[
         # Fila 1: Balance y Resumen
-        markup.add(
-            InlineKeyboardButton(f"{BotConstants.MONEY} Balance", callback_data="balance_actual"),
-            InlineKeyboardButton(f"{BotConstants.CHART} Resumen", callback_data="resumen_mes")
-        )
-        
+        [InlineKeyboardButton(_LBL_BALANCE, callback_data="balance_actual"),
+         InlineKeyboardButton(_LBL_RESUMEN, callback_data="resumen_mes")],
         # Fila 2: Ingresos y Gastos
-        markup.add(
-            InlineKeyboardButton(f"{BotConstants.INCOME} Ingresos", callback_data="menu_ingresos"),
-            InlineKeyboardButton(f"{BotConstants.EXPENSE} Gastos", callback_data="menu_gastos")
-        )
-        
+        [InlineKeyboardButton(_LBL_INGRESOS, callback_data="menu_ingresos"),
+         InlineKeyboardButton(_LBL_GASTOS, callback_data="menu_gastos")],
         # Fila 3: Ahorros y Suscripciones
-        markup.add(
-            InlineKeyboardButton("💳 Ahorros", callback_data="menu_ahorros"),
-            InlineKeyboardButton("🔄 Suscripciones", callback_data="menu_suscripciones")
-        )
-        
+        [InlineKeyboardButton("💳 Ahorros", callback_data="menu_ahorros"),
+         InlineKeyboardButton("🔄 Suscripciones", callback_data="menu_suscripciones")],
         # Fila 4: Recordatorios y Deudas
-        markup.add(
-            InlineKeyboardButton("🔔 Recordatorios", callback_data="menu_recordatorios"),
-            InlineKeyboardButton("💰 Deudas", callback_data="menu_deudas")
-        )
-        
+        [InlineKeyboardButton("🔔 Recordatorios", callback_data="menu_recordatorios"),
+         InlineKeyboardButton("💰 Deudas", callback_data="menu_deudas")],
         # Fila 5: Alertas e Histórico
-        markup.add(
-            InlineKeyboardButton("🚨 Alertas", callback_data="menu_alertas"),
-            InlineKeyboardButton("📊 Histórico", callback_data="menu_historico")
-        )
-        
+        [InlineKeyboardButton("🚨 Alertas", callback_data="menu_alertas"),
+         InlineKeyboardButton("📊 Histórico", callback_data="menu_historico")],
         # Fila 6: Configuración (centrada)
-        markup.add(
-            InlineKeyboardButton(f"{BotConstants.SETTINGS} Configurar", callback_data="menu_configuracion")
-        )
-        
-        return markup
-    
-    @staticmethod
-    def create_back_to_menu_markup() -> InlineKeyboardMarkup:
-        """Crea markup para volver al menú principal"""
-        markup = InlineKeyboardMarkup()
-        markup.add(InlineKeyboardButton(f"{BotConstants.HOME} Menú Principal", callback_data="back_to_menu"))
-        return markup
-    
-    @staticmethod
-    def create_movement_menu_markup(tipo: str) -> InlineKeyboardMarkup:
-        """Crea markup para menús de movimientos"""
-        markup = InlineKeyboardMarkup(row_width=1)
-        
-        tipo_title = tipo.title()
-        markup.add(
-            InlineKeyboardButton(f"Agregar {tipo_title}", callback_data=f"agregar_{tipo}"),
-            InlineKeyboardButton(f"Ver {tipo_title}s del Mes", callback_data=f"ver_{tipo}s_mes"),
-            InlineKeyboardButton(f"Ver Categorías", callback_data=f"ver_categorias_{tipo}"),
-            InlineKeyboardButton(f"{BotConstants.HOME} Menú Principal", callback_data="back_to_menu")
-        )
-        
-        return markup
-    
-    @staticmethod
-    def create_category_selection_markup(tipo: str, categorias: List[str]) -> InlineKeyboardMarkup:
-        """Crea markup para selección de categoría con opción de agregar nueva"""
-        markup = InlineKeyboardMarkup(row_width=2)
-        
-        emoji = BotConstants.INCOME if tipo == "ingreso" else BotConstants.EXPENSE if tipo == "gasto" else "💳"
-        
-        for categoria in categorias[:12]:  # Límite de 12 para evitar overflow
-            markup.add(
-                InlineKeyboardButton(
-                    f"{emoji} {categoria}", 
-                    callback_data=f"select_cat_{tipo}_{categoria}"
-                )
-            )
-        
-        # Botón para agregar nueva categoría
-        markup.add(
-            InlineKeyboardButton("✨ Nueva Categoría", callback_data=f"nueva_categoria_{tipo}")
-        )
-        
-        markup.add(
-            InlineKeyboardButton(f"{BotConstants.HOME} Menú Principal", callback_data="back_to_menu")
-        )
-        
-        return markup
-    
-    @staticmethod
-    def create_categories_view_markup(tipo: str) -> InlineKeyboardMarkup:
-        """Crea markup para ver categorías con totales"""
-        markup = InlineKeyboardMarkup(row_width=1)
-        markup.add(
-            InlineKeyboardButton("✨ Nueva Categoría", callback_data=f"nueva_categoria_{tipo}"),
-            InlineKeyboardButton(f"Agregar {tipo.title()}", callback_data=f"agregar_{tipo}"),
-            InlineKeyboardButton(f"{BotConstants.HOME} Menú Principal", callback_data="back_to_menu")
-        )
-        return markup
-    
-    @staticmethod
-    def create_movement_success_markup(tipo: str) -> InlineKeyboardMarkup:
-        """Crea markup para después de registrar un movimiento exitosamente"""
-        markup = InlineKeyboardMarkup(row_width=2)
-        
-        markup.add(
-            InlineKeyboardButton(f"Agregar Otro {tipo.title()}", callback_data=f"agregar_{tipo}"),
-            InlineKeyboardButton(f"{BotConstants.HOME} Menú Principal", callback_data="back_to_menu")
-        )
-        
-        return markup
-    
-    @staticmethod
-    def create_summary_menu_markup() -> InlineKeyboardMarkup:
-        """Crea markup para el menú de resumen"""
-        markup = InlineKeyboardMarkup(row_width=2)
-        markup.add(
-            InlineKeyboardButton("Ver Ingresos", callback_data="ver_ingresos_mes"),
-            InlineKeyboardButton("Ver Gastos", callback_data="ver_gastos_mes"),
-            InlineKeyboardButton("Ver Ahorros", callback_data="ver_ahorros_mes"),
-            InlineKeyboardButton(f"{BotConstants.HOME} Menú Principal", callback_data="back_to_menu")
-        )
-        return markup
-    
-    # ==================== SUSCRIPCIONES ====================
-    
-    @staticmethod
-    def create_subscriptions_menu_markup() -> InlineKeyboardMarkup:
-        """Crea markup para el menú de suscripciones"""
-        markup = InlineKeyboardMarkup(row_width=1)
-        markup.add(
-            InlineKeyboardButton("🔄 Nueva Suscripción", callback_data="agregar_suscripcion"),
-            InlineKeyboardButton("📋 Ver Suscripciones", callback_data="ver_suscripciones"),
-            InlineKeyboardButton(f"{BotConstants.HOME} Menú Principal", callback_data="back_to_menu")
-        )
-        return markup
-    
-    @staticmethod
-    def create_subscriptions_view_markup() -> InlineKeyboardMarkup:
-        """Crea markup para ver suscripciones"""
-        markup = InlineKeyboardMarkup(row_width=2)
-        markup.add(
-            InlineKeyboardButton("🔄 Nueva Suscripción", callback_data="agregar_suscripcion"),
-            InlineKeyboardButton(f"{BotConstants.HOME} Menú Principal", callback_data="back_to_menu")
-        )
-        return markup
-    
-    @staticmethod
-    def create_subscription_category_markup(categorias: List[str]) -> InlineKeyboardMarkup:
-        """Crea markup para seleccionar categoría de suscripción"""
-        markup = InlineKeyboardMarkup(row_width=2)
-        
-        for categoria in categorias[:10]:  # Límite para evitar overflow
-            markup.add(
-                InlineKeyboardButton(categoria, callback_data=f"suscripcion_cat_{categoria}")
-            )
-        
-        markup.add(
-            InlineKeyboardButton("❌ Cancelar", callback_data="back_to_menu")
-        )
-        
-        return markup
-    
-    @staticmethod
-    def create_subscription_success_markup() -> InlineKeyboardMarkup:
-        """Crea markup para después de crear una suscripción"""
-        markup = InlineKeyboardMarkup(row_width=1)
-        markup.add(
-            InlineKeyboardButton("🔄 Nueva Suscripción", callback_data="agregar_suscripcion"),
-            InlineKeyboardButton("📋 Ver Suscripciones", callback_data="ver_suscripciones"),
-            InlineKeyboardButton(f"{BotConstants.HOME} Menú Principal", callback_data="back_to_menu")
-        )
-        return markup
-    
-    # ==================== RECORDATORIOS ====================
-    
-    @staticmethod
-    def create_reminders_menu_markup() -> InlineKeyboardMarkup:
-        """Crea markup para el menú de recordatorios"""
-        markup = InlineKeyboardMarkup(row_width=1)
-        markup.add(
-            InlineKeyboardButton("🔔 Nuevo Recordatorio", callback_data="agregar_recordatorio"),
-            InlineKeyboardButton("📋 Ver Recordatorios", callback_data="ver_recordatorios"),
-            InlineKeyboardButton(f"{BotConstants.HOME} Menú Principal", callback_data="back_to_menu")
-        )
-        return markup
-    
-    @staticmethod
-    def create_reminders_view_markup() -> InlineKeyboardMarkup:
-        """Crea markup para ver recordatorios"""
-        markup = InlineKeyboardMarkup(row_width=2)
-        markup.add(
-            InlineKeyboardButton("🔔 Nuevo Recordatorio", callback_data="agregar_recordatorio"),
-            InlineKeyboardButton(f"{BotConstants.HOME} Menú Principal", callback_data="back_to_menu")
-        )
-        return markup
-    
-    @staticmethod
-    def create_reminder_success_markup() -> InlineKeyboardMarkup:
-        """Crea markup para después de crear un recordatorio"""
-        markup = InlineKeyboardMarkup(row_width=1)
-        markup.add(
-            InlineKeyboardButton("🔔 Nuevo Recordatorio", callback_data="agregar_recordatorio"),
-            InlineKeyboardButton("📋 Ver Recordatorios", callback_data="ver_recordatorios"),
-            InlineKeyboardButton(f"{BotConstants.HOME} Menú Principal", callback_data="back_to_menu")
-        )
-        return markup
-    
-    # ==================== DEUDAS ====================
-    
-    @staticmethod
-    def create_debts_menu_markup() -> InlineKeyboardMarkup:
-        """Crea markup para el menú de deudas"""
-        markup = InlineKeyboardMarkup(row_width=1)
-        markup.add(
-            InlineKeyboardButton("💰 Nueva Deuda", callback_data="agregar_deuda"),
-            InlineKeyboardButton("📋 Ver Deudas", callback_data="ver_deudas"),
-            InlineKeyboardButton(f"{BotConstants.HOME} Menú Principal", callback_data="back_to_menu")
-        )
-        return markup
-    
-    @staticmethod
-    def create_debts_view_markup() -> InlineKeyboardMarkup:
-        """Crea markup para ver deudas"""
-        markup = InlineKeyboardMarkup(row_width=2)
-        markup.add(
-            InlineKeyboardButton("💰 Nueva Deuda", callback_data="agregar_deuda"),
-            InlineKeyboardButton(f"{BotConstants.HOME} Menú Principal", callback_data="back_to_menu")
-        )
-        return markup
-    
-    @staticmethod
-    def create_debt_type_markup() -> InlineKeyboardMarkup:
-        """Crea markup para seleccionar tipo de deuda"""
-        markup = InlineKeyboardMarkup(row_width=2)
-        markup.add(
-            InlineKeyboardButton("📈 Me deben", callback_data="deuda_tipo_positiva"),
-            InlineKeyboardButton("📉 Yo debo", callback_data="deuda_tipo_negativa"),
-            InlineKeyboardButton("❌ Cancelar", callback_data="back_to_menu")
-        )
-        return markup
-    
-    @staticmethod
-    def create_debt_success_markup() -> InlineKeyboardMarkup:
-        """Crea markup para después de registrar una deuda"""
-        markup = InlineKeyboardMarkup(row_width=1)
-        markup.add(
-            InlineKeyboardButton("💰 Nueva Deuda", callback_data="agregar_deuda"),
-            InlineKeyboardButton("📋 Ver Deudas", callback_data="ver_deudas"),
-            InlineKeyboardButton(f"{BotConstants.HOME} Menú Principal", callback_data="back_to_menu")
-        )
-        return markup
-    
-    # ==================== ALERTAS ====================
-    
-    @staticmethod
-    def create_alerts_menu_markup() -> InlineKeyboardMarkup:
-        """Crea markup para el menú de alertas"""
-        markup = InlineKeyboardMarkup(row_width=1)
-        markup.add(
-            InlineKeyboardButton("🚨 Nueva Alerta", callback_data="agregar_alerta"),
-            InlineKeyboardButton("📋 Ver Alertas", callback_data="ver_alertas"),
-            InlineKeyboardButton(f"{BotConstants.HOME} Menú Principal", callback_data="back_to_menu")
-        )
-        return markup
-    
-    @staticmethod
-    def create_alert_type_markup() -> InlineKeyboardMarkup:
-        """Crea markup para seleccionar tipo de alerta"""
-        markup = InlineKeyboardMarkup(row_width=2)
-        markup.add(
-            InlineKeyboardButton("📅 Límite Diario", callback_data="alerta_tipo_diario"),
-            InlineKeyboardButton("📊 Límite Mensual", callback_data="alerta_tipo_mensual"),
-            InlineKeyboardButton("❌ Cancelar", callback_data="back_to_menu")
-        )
-        return markup
-    
-    @staticmethod
-    def create_alerts_view_markup() -> InlineKeyboardMarkup:
-        """Crea markup para ver alertas"""
-        markup = InlineKeyboardMarkup(row_width=2)
-        markup.add(
-            InlineKeyboardButton("🚨 Nueva Alerta", callback_data="agregar_alerta"),
-            InlineKeyboardButton(f"{BotConstants.HOME} Menú Principal", callback_data="back_to_menu")
-        )
-        return markup
+        [InlineKeyboardButton(_LBL_CONFIGURAR, callback_data="menu_configuracion")]
+    ])
+
+@_cached_markup
+def create_back_to_menu_markup() -> InlineKeyboardMarkup:
+    """Crea markup para volver al menú principal"""
+    return InlineKeyboardMarkup(keyboard=[
+        [_BTN_HOME]
+    ])
+
+@_cached_markup
+def create_movement_menu_markup(tipo: str) -> InlineKeyboardMarkup:
+    """Crea markup para menús de movimientos"""
+    return InlineKeyboardMarkup(keyboard=[
+        [_BTN_AGREGAR[tipo]],
+        [InlineKeyboardButton(_LBL_VER_MES[tipo], callback_data=_CB_VER_MES[tipo])],
+        [InlineKeyboardButton("Ver Categorías", callback_data=_CB_VER_CATEGORIAS[tipo])],
+        [_BTN_HOME]
+    ])
+
+def create_category_selection_markup(tipo: str, categorias: List[str]) -> InlineKeyboardMarkup:
+    """Crea markup para selección de categoría con opción de agregar nueva"""
+    emoji = _EMOJI_POR_TIPO[tipo]
+    prefijo = _CB_SELECT_CAT[tipo]
     
-    @staticmethod
-    def create_alert_success_markup() -> InlineKeyboardMarkup:
-        """Crea markup para después de crear una alerta"""
-        markup = InlineKeyboardMarkup(row_width=1)
-        markup.add(
-            InlineKeyboardButton("🚨 Nueva Alerta", callback_data="agregar_alerta"),
-            InlineKeyboardButton("📋 Ver Alertas", callback_data="ver_alertas"),
-            InlineKeyboardButton(f"{BotConstants.HOME} Menú Principal", callback_data="back_to_menu")
-        )
-        return markup
+    # Límite de 12 para evitar overflow
+    keyboard = [
+        [InlineKeyboardButton(f"{emoji} {categoria}", callback_data=prefijo + categoria)]
+        for categoria in categorias[:12]
+    ]
     
-    # ==================== CONFIGURACIÓN ====================
+    # Botón para agregar nueva categoría y volver al menú
+    keyboard += [[_BTN_NUEVA_CATEGORIA[tipo]], [_BTN_HOME]]
     
-    @staticmethod
-    def create_config_menu_markup() -> InlineKeyboardMarkup:
-        """Crea markup para el menú de configuración mejorado SIN exportar datos"""
-        markup = InlineKeyboardMarkup(row_width=1)
-        markup.add(
-            InlineKeyboardButton("💰 Cambiar Balance Inicial", callback_data="config_balance_inicial"),
-            InlineKeyboardButton("📊 Estadísticas del Bot", callback_data="config_estadisticas"),
-            InlineKeyboardButton(f"{BotConstants.HOME} Menú Principal", callback_data="back_to_menu")
-        )
-        return markup
+    return InlineKeyboardMarkup(keyboard=keyboard)
+
+@_cached_markup
+def create_categories_view_markup(tipo: str) -> InlineKeyboardMarkup:
+    """Crea markup para ver categorías con totales"""
+    return InlineKeyboardMarkup(keyboard=[
+        [_BTN_NUEVA_CATEGORIA[tipo]],
+        [_BTN_AGREGAR[tipo]],
+        [_BTN_HOME]
+    ])
+
+@_cached_markup
+def create_movement_success_markup(tipo: str) -> InlineKeyboardMarkup:
+    """Crea markup para después de registrar un movimiento exitosamente"""
+    return InlineKeyboardMarkup(keyboard=[
+        [InlineKeyboardButton(_LBL_AGREGAR_OTRO[tipo], callback_data=_CB_AGREGAR[tipo]),
+         _BTN_HOME]
+    ])
+
+@_cached_markup
+def create_summary_menu_markup() -> InlineKeyboardMarkup:
+    """Crea markup para el menú de resumen"""
+    return InlineKeyboardMarkup(keyboard=[
+        [InlineKeyboardButton("Ver Ingresos", callback_data="ver_ingresos_mes"),
+         InlineKeyboardButton("Ver Gastos", callback_data="ver_gastos_mes")],
+        [InlineKeyboardButton("Ver Ahorros", callback_data="ver_ahorros_mes"),
+         _BTN_HOME]
+    ])
+
+# ==================== SUSCRIPCIONES ====================
+
+@_cached_markup
+def create_subscriptions_menu_markup() -> InlineKeyboardMarkup:
+    """Crea markup para el menú de suscripciones"""
+    return InlineKeyboardMarkup(keyboard=[
+        [_BTN_NUEVA_SUSCRIPCION],
+        [_BTN_VER_SUSCRIPCIONES],
+        [_BTN_HOME]
+    ])
+
+@_cached_markup
+def create_subscriptions_view_markup() -> InlineKeyboardMarkup:
+    """Crea markup para ver suscripciones"""
+    return InlineKeyboardMarkup(keyboard=[
+        [_BTN_NUEVA_SUSCRIPCION,
+         _BTN_HOME]
+    ])
+
+def create_subscription_category_markup(categorias: List[str]) -> InlineKeyboardMarkup:
+    """Crea markup para seleccionar categoría de suscripción"""
+    # Límite para evitar overflow
+    keyboard = [
+        [InlineKeyboardButton(categoria, callback_data=f"suscripcion_cat_{categoria}")]
+        for categoria in categorias[:10]
+    ]
+    keyboard.append([_BTN_CANCEL])
     
-    @staticmethod
-    def create_cancel_markup() -> InlineKeyboardMarkup:
-        """Crea markup para cancelar operación"""
-        markup = InlineKeyboardMarkup()
-        markup.add(
-            InlineKeyboardButton("❌ Cancelar", callback_data="back_to_menu")
-        )
-        return markup
+    return InlineKeyboardMarkup(keyboard=keyboard)
+
+@_cached_markup
+def create_subscription_success_markup() -> InlineKeyboardMarkup:
+    """Crea markup para después de crear una suscripción"""
+    return InlineKeyboardMarkup(keyboard=[
+        [_BTN_NUEVA_SUSCRIPCION],
+        [_BTN_VER_SUSCRIPCIONES],
+        [_BTN_HOME]
+    ])
+
+# ==================== RECORDATORIOS ====================
+
+@_cached_markup
+def create_reminders_menu_markup() -> InlineKeyboardMarkup:
+    """Crea markup para el menú de recordatorios"""
+    return InlineKeyboardMarkup(keyboard=[
+        [_BTN_NUEVO_RECORDATORIO],
+        [_BTN_VER_RECORDATORIOS],
+        [_BTN_HOME]
+    ])
+
+@_cached_markup
+def create_reminders_view_markup() -> InlineKeyboardMarkup:
+    """Crea markup para ver recordatorios"""
+    return InlineKeyboardMarkup(keyboard=[
+        [_BTN_NUEVO_RECORDATORIO,
+         _BTN_HOME]
+    ])
+
+@_cached_markup
+def create_reminder_success_markup() -> InlineKeyboardMarkup:
+    """Crea markup para después de crear un recordatorio"""
+    return InlineKeyboardMarkup(keyboard=[
+        [_BTN_NUEVO_RECORDATORIO],
+        [_BTN_VER_RECORDATORIOS],
+        [_BTN_HOME]
+    ])
+
+# ==================== DEUDAS ====================
+
+@_cached_markup
+def create_debts_menu_markup() -> InlineKeyboardMarkup:
+    """Crea markup para el menú de deudas"""
+    return InlineKeyboardMarkup(keyboard=[
+        [_BTN_NUEVA_DEUDA],
+        [_BTN_VER_DEUDAS],
+        [_BTN_HOME]
+    ])
+
+@_cached_markup
+def create_debts_view_markup() -> InlineKeyboardMarkup:
+    """Crea markup para ver deudas"""
+    return InlineKeyboardMarkup(keyboard=[
+        [_BTN_NUEVA_DEUDA,
+         _BTN_HOME]
+    ])
+
+@_cached_markup
+def create_debt_type_markup() -> InlineKeyboardMarkup:
+    """Crea markup para seleccionar tipo de deuda"""
+    return InlineKeyboardMarkup(keyboard=[
+        [InlineKeyboardButton("📈 Me deben", callback_data="deuda_tipo_positiva"),
+         InlineKeyboardButton("📉 Yo debo", callback_data="deuda_tipo_negativa")],
+        [_BTN_CANCEL]
+    ])
+
+@_cached_markup
+def create_debt_success_markup() -> InlineKeyboardMarkup:
+    """Crea markup para después de registrar una deuda"""
+    return InlineKeyboardMarkup(keyboard=[
+        [_BTN_NUEVA_DEUDA],
+        [_BTN_VER_DEUDAS],
+        [_BTN_HOME]
+    ])
+
+# ==================== ALERTAS ====================
+
+@_cached_markup
+def create_alerts_menu_markup() -> InlineKeyboardMarkup:
+    """Crea markup para el menú de alertas"""
+    return InlineKeyboardMarkup(keyboard=[
+        [_BTN_NUEVA_ALERTA],
+        [_BTN_VER_ALERTAS],
+        [_BTN_HOME]
+    ])
+
+@_cached_markup
+def create_alert_type_markup() -> InlineKeyboardMarkup:
+    """Crea markup para seleccionar tipo de alerta"""
+    return InlineKeyboardMarkup(keyboard=[
+        [InlineKeyboardButton("📅 Límite Diario", callback_data="alerta_tipo_diario"),
+         InlineKeyboardButton("📊 Límite Mensual", callback_data="alerta_tipo_mensual")],
+        [_BTN_CANCEL]
+    ])
+
+@_cached_markup
+def create_alerts_view_markup() -> InlineKeyboardMarkup:
+    """Crea markup para ver alertas"""
+    return InlineKeyboardMarkup(keyboard=[
+        [_BTN_NUEVA_ALERTA,
+         _BTN_HOME]
+    ])
+
+@_cached_markup
+def create_alert_success_markup() -> InlineKeyboardMarkup:
+    """Crea markup para después de crear una alerta"""
+    return InlineKeyboardMarkup(keyboard=[
+        [_BTN_NUEVA_ALERTA],
+        [_BTN_VER_ALERTAS],
+        [_BTN_HOME]
+    ])
+
+# ==================== CONFIGURACIÓN ====================
+
+@_cached_markup
+def create_config_menu_markup() -> InlineKeyboardMarkup:
+    """Crea markup para el menú de configuración mejorado SIN exportar datos"""
+    return InlineKeyboardMarkup(keyboard=[
+        [InlineKeyboardButton("💰 Cambiar Balance Inicial", callback_data="config_balance_inicial")],
+        [InlineKeyboardButton("📊 Estadísticas del Bot", callback_data="config_estadisticas")],
+        [_BTN_HOME]
+    ])
+
+@_cached_markup
+def create_cancel_markup() -> InlineKeyboardMarkup:
+    """Crea markup para cancelar operación"""
+    return InlineKeyboardMarkup(keyboard=[
+        [_BTN_CANCEL]
+    ])
\ No newline at end of file
@@ -2,16 +2,42 @@
 Gestor de memoria para optimizar el rendimiento del bot
 """
 
+import ctypes
 import gc
 import logging
+import sys
 import threading
 import time
-from typing import Dict, Any
+import weakref
+from collections import Counter, OrderedDict
+from queue import Empty, SimpleQueue
+from typing import Dict, Any, NamedTuple, Optional
 import psutil
 import os
 
 logger = logging.getLogger(__name__)
 
+# En Linux el RSS se lee directamente de /proc/self/statm (una línea, en páginas)
+_STATM_PATH = "/proc/self/statm"
+_HAS_STATM = os.path.exists(_STATM_PATH)
+_PAGESIZE = os.sysconf("SC_PAGE_SIZE") if _HAS_STATM else 0
+
+# Los umbrales del GC son globales al proceso: se ajustan una sola vez
+_gc_config_lock = threading.Lock()
+_gc_configured = False
+
+# Instancias vivas cuyo proceso de psutil se reconstruye en el hijo tras un fork
+_instances: "weakref.WeakSet[MemoryManager]" = weakref.WeakSet()
+
+def _refresh_processes():
+    """Reconstruye el proceso de psutil de cada instancia con el pid del hijo"""
+    for instance in list(_instances):
+        instance._refresh_process()
+
+# Se registra una sola vez por módulo, no por instancia
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_refresh_processes)
+
 class MemoryManager:
     """Gestor de memoria para mantener el bot optimizado"""
     
@@ -20,6 +46,26 @@ class MemoryManager:
         self.cleanup_thread = None
         self.running = False
         self.memory_threshold = 80  # Porcentaje de memoria antes de forzar limpieza
+        self._process = psutil.Process(os.getpid())
+        self._total_ram = psutil.virtual_memory().total
+        # El pid solo cambia en un proceso hijo tras fork
+        _instances.add(self)
+        
+        # El callback del GC avisa al hilo de monitoreo cuando hay presión de memoria
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._pressure_pct = 0.0
+        self._gc_muted = False  # Ignora las recolecciones propias y la reentrada
+        
+        # Intervalo mínimo entre limpiezas forzadas; se duplica si no liberan memoria
+        self._last_force = 0.0
+        self._min_force_interval = 600  # 10 minutos
+        self._max_force_interval = 6 * 3600
+        self._force_interval = self._min_force_interval
+    
+    def _refresh_process(self):
+        """Reconstruye el proceso de psutil con el pid del hijo tras un fork"""
+        self._process = psutil.Process(os.getpid())
     
     def start_monitoring(self):
         """Inicia el monitoreo automático de memoria"""
@@ -27,6 +73,11 @@ class MemoryManager:
             return
             
         self.running = True
+        self._stop.clear()
+        self._wake.clear()
+        if self._on_gc not in gc.callbacks:
+            gc.callbacks.append(self._on_gc)
+        
         self.cleanup_thread = threading.Thread(target=self._memory_monitor, daemon=True)
         self.cleanup_thread.start()
         logger.info("Monitor de memoria iniciado")
@@ -34,36 +85,95 @@ class MemoryManager:
     def stop_monitoring(self):
         """Detiene el monitoreo de memoria"""
         self.running = False
+        try:
+            gc.callbacks.remove(self._on_gc)
+        except ValueError:
+            pass
+        
+        # Despierta al hilo tanto en la espera normal como en la de error
+        self._stop.set()
+        self._wake.set()
         if self.cleanup_thread:
             self.cleanup_thread.join(timeout=5)
         logger.info("Monitor de memoria detenido")
     
+    def _on_gc(self, phase: str, info: Dict[str, Any]):
+        """Muestrea la memoria solo tras una recolección completa"""
+        if phase != "stop" or info.get("generation") != 2 or self._gc_muted:
+            return
+        
+        self._gc_muted = True
+        try:
+            memory_percent = self.get_memory_usage()
+            if memory_percent > self.memory_threshold:
+                # No se puede recolectar dentro de un callback del GC; lo hace el hilo
+                self._pressure_pct = memory_percent
+                self._wake.set()
+        finally:
+            self._gc_muted = False
+    
     def _memory_monitor(self):
-        """Hilo de monitoreo de memoria"""
+        """Hilo de monitoreo: limpieza por presión de memoria o cada hora"""
         while self.running:
             try:
-                # Verificar uso de memoria
-                memory_percent = self.get_memory_usage()
+                presion = self._wake.wait(self.cleanup_interval)
+                self._wake.clear()
+                if self._stop.is_set():
+                    break
                 
-                if memory_percent > self.memory_threshold:
-                    logger.warning(f"Memoria alta detectada: {memory_percent:.1f}%")
-                    self.force_cleanup()
-                
-                # Limpieza periódica ligera
-                if int(time.time()) % self.cleanup_interval == 0:
-                    self.periodic_cleanup()
-                
-                time.sleep(60)  # Verificar cada minuto
+                self._gc_muted = True
+                try:
+                    if not presion:
+                        # Muestra por reloj: el callback del GC solo ve recolecciones completas
+                        memory_percent = self.get_memory_usage()
+                        if memory_percent > self.memory_threshold:
+                            self._pressure_pct = memory_percent
+                            presion = True
+                    
+                    if presion:
+                        self._limpieza_por_presion()
+                    else:
+                        # Limpieza periódica ligera
+                        self.periodic_cleanup()
+                finally:
+                    self._gc_muted = False
                 
             except Exception as e:
                 logger.error(f"Error en monitor de memoria: {e}")
-                time.sleep(300)  # Esperar 5 minutos en caso de error
+                # Esperar 5 minutos en caso de error, salvo que se detenga antes
+                if self._stop.wait(300):
+                    break
+    
+    def _limpieza_por_presion(self):
+        """Fuerza una limpieza respetando el intervalo mínimo con backoff adaptativo"""
+        ahora = time.monotonic()
+        if ahora - self._last_force < self._force_interval:
+            return
+        
+        self._last_force = ahora
+        antes = self._pressure_pct
+        logger.warning(f"Memoria alta detectada: {antes:.1f}%")
+        despues = self.force_cleanup(pre_pct=antes)
+        
+        if despues is not None and antes - despues >= 5:
+            self._force_interval = self._min_force_interval
+            return
+        
+        # La limpieza no liberó memoria: repetirla pronto no ayudaría
+        if self._force_interval < self._max_force_interval:
+            self._force_interval = min(self._force_interval * 2, self._max_force_interval)
+            if self._force_interval == self._max_force_interval:
+                logger.warning("La limpieza forzada no reduce la memoria; posible fuga de memoria")
     
     def get_memory_usage(self) -> float:
         """Obtiene el porcentaje de uso de memoria del proceso"""
         try:
-            process = psutil.Process(os.getpid())
-            return process.memory_percent()
+            if _HAS_STATM:
+                with open(_STATM_PATH, 'rb', buffering=0) as f:
+                    rss_pages = int(f.read().split()[1])
+                return rss_pages * _PAGESIZE / self._total_ram * 100
+            
+            return self._process.memory_percent()
         except Exception as e:
             logger.error(f"Error obteniendo uso de memoria: {e}")
             return 0.0
@@ -71,14 +181,15 @@ class MemoryManager:
     def get_memory_info(self) -> Dict[str, Any]:
         """Obtiene información detallada de memoria"""
         try:
-            process = psutil.Process(os.getpid())
-            memory_info = process.memory_info()
+            # Una sola lectura de cada fuente; el porcentaje se deriva de ellas
+            memory_info = self._process.memory_info()
+            virtual_memory = psutil.virtual_memory()
             
             return {
                 'rss_mb': memory_info.rss / 1024 / 1024,  # MB
                 'vms_mb': memory_info.vms / 1024 / 1024,  # MB
-                'percent': process.memory_percent(),
-                'available_mb': psutil.virtual_memory().available / 1024 / 1024
+                'percent': memory_info.rss / virtual_memory.total * 100,
+                'available_mb': virtual_memory.available / 1024 / 1024
             }
         except Exception as e:
             logger.error(f"Error obteniendo información de memoria: {e}")
@@ -94,25 +205,27 @@ class MemoryManager:
         except Exception as e:
             logger.error(f"Error en limpieza periódica: {e}")
     
-    def force_cleanup(self):
-        """Limpieza forzada más agresiva"""
+    def force_cleanup(self, pre_pct: Optional[float] = None) -> Optional[float]:
+        """Limpieza forzada más agresiva; retorna el porcentaje de memoria resultante
+        
+        pre_pct es la muestra ya tomada antes de limpiar, para no volver a leerla.
+        """
         try:
             logger.info("Iniciando limpieza forzada de memoria")
             
-            # Recolección de basura completa
-            gc.disable()
-            collected = 0
-            for generation in range(3):
-                collected += gc.collect(generation)
-            gc.enable()
+            # Una recolección completa ya incluye las generaciones 0 y 1
+            collected = gc.collect()
             
-            # Log de resultados
-            memory_info = self.get_memory_info()
+            # Una sola muestra posterior sirve para el log y para el llamador
+            post_pct = self.get_memory_usage()
+            delta = f" ({post_pct - pre_pct:+.1f} pts)" if pre_pct is not None else ""
             logger.info(f"Limpieza completada: {collected} objetos recolectados, "
-                       f"memoria: {memory_info.get('percent', 0):.1f}%")
+                       f"memoria: {post_pct:.1f}%{delta}")
+            return post_pct
             
         except Exception as e:
             logger.error(f"Error en limpieza forzada: {e}")
+            return None
     
     def cleanup_all(self):
         """Limpieza completa al cerrar el bot"""
@@ -120,24 +233,39 @@ class MemoryManager:
             logger.info("Limpieza completa de memoria")
             
             # Recolección completa
-            for _ in range(3):
-                gc.collect()
+            gc.collect()
             
-            # Desfragmentar si es posible
+            # Devolver al sistema las páginas libres del heap (solo glibc)
             try:
-                gc.set_debug(0)
-            except:
+                ctypes.CDLL("libc.so.6").malloc_trim(0)
+            except (OSError, AttributeError):
                 pass
                 
         except Exception as e:
             logger.error(f"Error en limpieza completa: {e}")
     
     def optimize_collections(self):
-        """Optimiza los parámetros del recolector de basura"""
+        """Congela el heap de arranque y espacía las recolecciones de generación 0
+        
+        Llamar cuando el bot ya cargó handlers y base de datos; las llamadas
+        posteriores (de cualquier instancia) no hacen nada.
+        """
+        global _gc_configured
+        
         try:
-            # Configurar thresholds más agresivos para entornos con poca memoria
-            gc.set_threshold(700, 10, 10)  # Valores más conservadores
-            logger.debug("Thresholds de GC optimizados")
+            with _gc_config_lock:
+                if _gc_configured:
+                    return
+                _gc_configured = True
+                
+                # Los objetos vivos tras el arranque pasan a la generación permanente
+                gc.collect(2)
+                gc.freeze()
+                
+                _, gen1, gen2 = gc.get_threshold()
+                gc.set_threshold(50_000, gen1, gen2)
+            
+            logger.debug(f"GC optimizado: {gc.get_freeze_count()} objetos congelados")
         except Exception as e:
             logger.error(f"Error optimizando recolector: {e}")
     
@@ -156,65 +284,162 @@ class MemoryManager:
         except Exception as e:
             logger.error(f"Error en log de estadísticas: {e}")
 
+class _TrackedInfo(NamedTuple):
+    """Metadatos de un objeto rastreado (tupla, sin dict por entrada)"""
+    name: str
+    type: str
+    size: int
+    timestamp: float
+
 class ObjectTracker:
     """Rastreador de objetos para detectar memory leaks"""
     
+    __slots__ = ('tracked_objects', 'enabled', '_finalizers', '_allocs', '_frees', '_type_counts',
+                 '_lock', '_freed')
+    
     def __init__(self):
-        self.tracked_objects = {}
+        # Orden de inserción = orden de timestamp; las entradas más antiguas van primero
+        self.tracked_objects: OrderedDict = OrderedDict()
         self.enabled = False
+        
+        # Finalizadores que retiran la entrada cuando el objeto se libera
+        self._finalizers: Dict[int, weakref.finalize] = {}
+        # Objetos rastreados y liberados por nombre, para estimar fugas
+        self._allocs: Dict[str, int] = {}
+        self._frees: Dict[str, int] = {}
+        # Histograma por tipo mantenido de forma incremental
+        self._type_counts: Counter = Counter()
+        
+        # Los finalizadores corren en cualquier hilo, incluso con el lock tomado:
+        # solo encolan la entrada y los métodos públicos la procesan bajo el lock
+        self._lock = threading.Lock()
+        self._freed: SimpleQueue = SimpleQueue()
+        
+        # Mientras está deshabilitado, los métodos públicos son no-ops sin comprobaciones
+        self.__class__ = _DisabledObjectTracker
     
     def enable_tracking(self):
         """Habilita el rastreo de objetos (solo para debugging)"""
         self.enabled = True
+        self.__class__ = ObjectTracker
         logger.debug("Rastreo de objetos habilitado")
     
     def track_object(self, obj_name: str, obj):
         """Rastrea un objeto específico"""
-        if not self.enabled:
-            return
-            
         obj_id = id(obj)
-        self.tracked_objects[obj_id] = {
-            'name': obj_name,
-            'type': type(obj).__name__,
-            'size': len(str(obj)) if hasattr(obj, '__len__') else 0,
-            'timestamp': time.time()
-        }
+        obj_type = type(obj).__name__
+        # Tamaño superficial en O(1), sin repr
+        obj_info = _TrackedInfo(obj_name, obj_type, sys.getsizeof(obj), time.monotonic())
+        
+        with self._lock:
+            self._drain_freed()
+            
+            # Volver a rastrear un objeto lo mueve al final de la cola
+            self._forget(obj_id)
+            
+            self.tracked_objects[obj_id] = obj_info
+            self._allocs[obj_name] = self._allocs.get(obj_name, 0) + 1
+            self._type_counts[obj_type] += 1
+            
+            try:
+                self._finalizers[obj_id] = weakref.finalize(obj, self._on_finalize, obj_id, obj_info)
+            except TypeError:
+                # Tipos sin soporte de weakref (int, tuple...): solo untrack_object los retira
+                pass
     
     def untrack_object(self, obj):
         """Deja de rastrear un objeto"""
-        if not self.enabled:
-            return
+        with self._lock:
+            self._drain_freed()
+            self._forget(id(obj))
+    
+    def _forget(self, obj_id: int) -> Optional[_TrackedInfo]:
+        """Retira una entrada, su finalizador y su conteo por tipo (requiere el lock)"""
+        obj_info = self.tracked_objects.pop(obj_id, None)
+        if obj_info is None:
+            return None
+        
+        finalizer = self._finalizers.pop(obj_id, None)
+        if finalizer:
+            finalizer.detach()
+        
+        obj_type = obj_info.type
+        self._type_counts[obj_type] -= 1
+        if not self._type_counts[obj_type]:
+            del self._type_counts[obj_type]
+        
+        return obj_info
+    
+    def _on_finalize(self, obj_id: int, obj_info: _TrackedInfo):
+        """Encola la entrada de un objeto liberado por el GC; no toma el lock"""
+        self._freed.put((obj_id, obj_info))
+    
+    def _drain_freed(self):
+        """Retira las entradas de los objetos ya liberados (requiere el lock)"""
+        while True:
+            try:
+                obj_id, obj_info = self._freed.get_nowait()
+            except Empty:
+                return
             
-        obj_id = id(obj)
-        self.tracked_objects.pop(obj_id, None)
+            # El id puede haberse reutilizado por un objeto rastreado después
+            if self.tracked_objects.get(obj_id) is not obj_info:
+                continue
+            
+            self._forget(obj_id)
+            name = obj_info.name
+            self._frees[name] = self._frees.get(name, 0) + 1
+    
+    def leak_score(self, obj_name: str) -> float:
+        """Probabilidad estimada de fuga según objetos rastreados vs liberados
+        
+        Regla de sucesión de Laplace: 1 - (liberados + 1) / (rastreados + 2).
+        """
+        with self._lock:
+            self._drain_freed()
+            allocs = self._allocs.get(obj_name, 0)
+            frees = self._frees.get(obj_name, 0)
+        return 1 - (frees + 1) / (allocs + 2)
     
     def get_tracked_stats(self) -> Dict[str, int]:
         """Obtiene estadísticas de objetos rastreados"""
-        if not self.enabled:
-            return {}
-            
-        stats = {}
-        for obj_info in self.tracked_objects.values():
-            obj_type = obj_info['type']
-            stats[obj_type] = stats.get(obj_type, 0) + 1
-            
-        return stats
+        with self._lock:
+            self._drain_freed()
+            return dict(self._type_counts)
     
     def cleanup_old_references(self, max_age: int = 3600):
         """Limpia referencias de objetos antiguos"""
-        if not self.enabled:
-            return
-            
-        current_time = time.time()
-        to_remove = []
+        current_time = time.monotonic()
+        removed = 0
         
-        for obj_id, obj_info in self.tracked_objects.items():
-            if current_time - obj_info['timestamp'] > max_age:
-                to_remove.append(obj_id)
-        
-        for obj_id in to_remove:
-            del self.tracked_objects[obj_id]
+        with self._lock:
+            self._drain_freed()
+            
+            # Solo se recorren las entradas vencidas: la primera vigente corta el ciclo
+            while self.tracked_objects:
+                obj_id, obj_info = next(iter(self.tracked_objects.items()))
+                if current_time - obj_info.timestamp <= max_age:
+                    break
+                
+                self._forget(obj_id)
+                removed += 1
             
-        if to_remove:
-            logger.debug(f"Limpiadas {len(to_remove)} referencias antiguas")
\ No newline at end of file
+        if removed:
+            logger.debug(f"Limpiadas {removed} referencias antiguas")
+
+class _DisabledObjectTracker(ObjectTracker):
+    """ObjectTracker con el rastreo deshabilitado: los métodos públicos no hacen nada"""
+    
+    __slots__ = ()
+    
+    def track_object(self, obj_name: str, obj):
+        pass
+    
+    def untrack_object(self, obj):
+        pass
+    
+    def get_tracked_stats(self) -> Dict[str, int]:
+        return {}
+    
+    def cleanup_old_references(self, max_age: int = 3600):
+        pass
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""
+Control de tasa para las llamadas a la API de Telegram
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """Token bucket thread-safe para limitar llamadas por segundo"""
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def try_acquire(self) -> float:
+        """Toma un token sin bloquear; retorna 0 si lo obtuvo o los segundos a esperar"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            
+            return (1 - self._tokens) / self.rate
+    
+    def acquire(self):
+        """Bloquea hasta que haya un token disponible"""
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            time.sleep(wait)
+
+class EditDispatcher:
+    """Despacha ediciones de mensajes respetando los límites de Telegram
+    
+    Telegram admite ~30 mensajes/s por bot y ~1 edición/s por chat. Si una edición
+    llega antes de tiempo no se espera en el hilo que la pide: queda pendiente y un
+    temporizador envía después solo la más reciente de ese mensaje.
+    """
+    
+    MAX_TRACKED_MESSAGES = 500
+    
+    def __init__(self, edit_func: Callable, rate: float = 25, burst: int = 30,
+                 edit_interval: float = 0.8):
+        self._edit_func = edit_func
+        self._bucket = TokenBucket(rate, burst)
+        self.edit_interval = edit_interval
+        self._lock = threading.Lock()
+        
+        # (chat_id, message_id) -> (texto, kwargs) de la edición pendiente más reciente
+        self._pending: Dict[Tuple[int, int], Tuple[str, dict]] = {}
+        # (chat_id, message_id) -> momento de la última edición enviada
+        self._last_sent: Dict[Tuple[int, int], float] = {}
+    
+    def edit(self, text: str, chat_id: int, message_id: int, **kwargs) -> bool:
+        """Edita un mensaje; retorna False si la edición quedó diferida"""
+        key = (chat_id, message_id)
+        
+        with self._lock:
+            # Ya hay un envío programado: solo se reemplaza su contenido
+            if key in self._pending:
+                self._pending[key] = (text, kwargs)
+                return False
+            
+            last = self._last_sent.get(key)
+            wait = last + self.edit_interval - time.monotonic() if last is not None else 0
+            if wait <= 0:
+                wait = self._bucket.try_acquire()
+            
+            if wait > 0:
+                self._pending[key] = (text, kwargs)
+                self._schedule(key, wait)
+                return False
+            
+            self._remember(key)
+        
+        self._edit_func(text, chat_id, message_id, **kwargs)
+        return True
+    
+    def _schedule(self, key: Tuple[int, int], wait: float):
+        """Programa el envío de la edición pendiente de un mensaje"""
+        timer = threading.Timer(wait, self._flush, args=(key,))
+        timer.daemon = True
+        timer.start()
+    
+    def _flush(self, key: Tuple[int, int]):
+        """Envía la edición pendiente más reciente de un mensaje"""
+        with self._lock:
+            wait = self._bucket.try_acquire()
+            if wait > 0:
+                self._schedule(key, wait)
+                return
+            
+            pending = self._pending.pop(key, None)
+            if pending is None:
+                return
+            
+            self._remember(key)
+        
+        text, kwargs = pending
+        try:
+            self._edit_func(text, key[0], key[1], **kwargs)
+        except Exception as e:
+            logger.error(f"Error enviando edición diferida: {e}")
+    
+    def _remember(self, key: Tuple[int, int]):
+        """Registra el momento del envío con límite de memoria (requiere self._lock)"""
+        self._last_sent.pop(key, None)
+        
+        if len(self._last_sent) >= self.MAX_TRACKED_MESSAGES:
+            # Eliminar la edición más antigua
+            del self._last_sent[next(iter(self._last_sent))]
+        
+        self._last_sent[key] = time.monotonic()
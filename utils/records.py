@@ -0,0 +1,44 @@
+"""
+Registros ligeros devueltos por la base de datos para los listados del bot
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass(slots=True)
+class Movimiento:
+    """Movimiento (ingreso, gasto o ahorro) de un mes"""
+    id: int
+    fecha: str
+    tipo: str
+    categoria: str
+    monto: float
+    descripcion: str
+
+@dataclass(slots=True)
+class Suscripcion:
+    """Suscripción activa"""
+    id: int
+    nombre: str
+    monto: float
+    categoria: str
+    dia_cobro: int
+    proximo_cobro: str
+
+@dataclass(slots=True)
+class Recordatorio:
+    """Recordatorio activo"""
+    id: int
+    descripcion: str
+    monto: Optional[float]
+    fecha_vencimiento: str
+
+@dataclass(slots=True)
+class Deuda:
+    """Deuda activa; el monto es positivo si te deben y negativo si debes"""
+    id: int
+    nombre: str
+    monto: float
+    tipo: str
+    descripcion: str
+    fecha_creacion: str
@@ -3,61 +3,72 @@ Validador de entradas del usuario
 """
 
 import re
-from datetime import date, datetime
+from datetime import date
 from typing import Optional
 from config.settings import BotConstants
 
+# Fechas DD/MM/YYYY y DD/MM
+_DATE_FULL_RE = re.compile(r'^\d{1,2}/\d{1,2}/\d{4}$')
+_DATE_SHORT_RE = re.compile(r'^\d{1,2}/\d{1,2}$')
+
+# Caracteres de control (C0, DEL y C1) que se eliminan al sanitizar
+_CTRL_TABLE = dict.fromkeys(range(0x00, 0x20)) | dict.fromkeys(range(0x7f, 0xa0))
+
+# Días del mes aceptados ("1".."31" y "01".."09") -> número de día
+_DIAS_VALIDOS = {str(d): d for d in range(1, 32)} | {f"{d:02d}": d for d in range(1, 10)}
+
+# Separadores de miles, símbolo de moneda y espacios que se ignoran en los montos
+_MONEY_STRIP = str.maketrans('', '', ',$ ')
+
+def _len_between(texto, minimo: int, maximo: int) -> bool:
+    """Verifica que texto sea str y que su largo sin espacios esté en el rango"""
+    return type(texto) is str and minimo <= len(texto.strip()) <= maximo
+
 class InputValidator:
     """Clase para validar todas las entradas del usuario"""
     
+    @staticmethod
+    def parse_amount(amount_str: str, allow_zero: bool = False) -> Optional[float]:
+        """Convierte una cadena en monto; retorna None si no es válido"""
+        if not amount_str or not isinstance(amount_str, str):
+            return None
+        
+        # Limpiar la cadena
+        cleaned = amount_str.strip().translate(_MONEY_STRIP)
+        
+        # Verificar que solo contenga dígitos con punto decimal opcional (sin regex)
+        entero, _, decimales = cleaned.partition('.')
+        if not entero.isdecimal() or (decimales and not decimales.isdecimal()):
+            return None
+        
+        amount = float(cleaned)
+        
+        # Verificar rangos
+        minimo = 0 if allow_zero else BotConstants.MIN_AMOUNT
+        if not minimo <= amount <= BotConstants.MAX_AMOUNT:
+            return None
+        
+        return amount
+    
     @staticmethod
     def is_valid_amount(amount_str: str, allow_zero: bool = False) -> bool:
         """Valida si una cadena representa un monto válido"""
-        try:
-            # Limpiar la cadena
-            cleaned = amount_str.strip().replace(',', '').replace('$', '')
-            
-            # Verificar que solo contenga números y punto decimal
-            if not re.match(r'^\d+\.?\d*$', cleaned):
-                return False
-            
-            amount = float(cleaned)
-            
-            # Verificar rangos
-            if allow_zero:
-                return 0 <= amount <= BotConstants.MAX_AMOUNT
-            else:
-                return BotConstants.MIN_AMOUNT <= amount <= BotConstants.MAX_AMOUNT
-                
-        except (ValueError, TypeError):
-            return False
+        return InputValidator.parse_amount(amount_str, allow_zero) is not None
     
     @staticmethod
     def is_valid_category_name(name: str) -> bool:
         """Valida el nombre de una categoría"""
-        if not name or not isinstance(name, str):
-            return False
-            
-        name = name.strip()
-        return 2 <= len(name) <= BotConstants.MAX_CATEGORY_NAME_LENGTH
+        return _len_between(name, 2, BotConstants.MAX_CATEGORY_NAME_LENGTH)
     
     @staticmethod
     def is_valid_subscription_name(name: str) -> bool:
         """Valida el nombre de una suscripción"""
-        if not name or not isinstance(name, str):
-            return False
-            
-        name = name.strip()
-        return 2 <= len(name) <= BotConstants.MAX_SUBSCRIPTION_NAME_LENGTH
+        return _len_between(name, 2, BotConstants.MAX_SUBSCRIPTION_NAME_LENGTH)
     
     @staticmethod
     def is_valid_description(description: str) -> bool:
         """Valida una descripción"""
-        if not description or not isinstance(description, str):
-            return False
-            
-        description = description.strip()
-        return 2 <= len(description) <= BotConstants.MAX_DESCRIPTION_LENGTH
+        return _len_between(description, 2, BotConstants.MAX_DESCRIPTION_LENGTH)
     
     @staticmethod
     def parse_date(date_str: str) -> Optional[date]:
@@ -68,29 +79,34 @@ class InputValidator:
         date_str = date_str.strip()
         
         try:
-            # Intentar formato DD/MM/YYYY
-            if re.match(r'^\d{1,2}/\d{1,2}/\d{4}$', date_str):
-                return datetime.strptime(date_str, '%d/%m/%Y').date()
+            # Formato DD/MM/YYYY: la forma ya está validada, date() valida los rangos
+            if _DATE_FULL_RE.match(date_str):
+                dia, mes, año = date_str.split('/')
+                return date(int(año), int(mes), int(dia))
             
             # Intentar formato DD/MM (año actual)
-            if re.match(r'^\d{1,2}/\d{1,2}$', date_str):
-                current_year = date.today().year
-                full_date_str = f"{date_str}/{current_year}"
-                return datetime.strptime(full_date_str, '%d/%m/%Y').date()
+            if _DATE_SHORT_RE.match(date_str):
+                dia, mes = date_str.split('/')
+                return date(date.today().year, int(mes), int(dia))
                 
         except ValueError:
             pass
             
         return None
     
+    @staticmethod
+    def parse_day(day_str: str) -> Optional[int]:
+        """Convierte una cadena en día del mes (1-31); retorna None si no es válido"""
+        if not day_str or not isinstance(day_str, str):
+            return None
+        
+        # Búsqueda directa: sin conversión a int ni rama de error
+        return _DIAS_VALIDOS.get(day_str.strip())
+    
     @staticmethod
     def is_valid_day(day_str: str) -> bool:
         """Valida un día del mes (1-31)"""
-        try:
-            day = int(day_str.strip())
-            return 1 <= day <= 31
-        except (ValueError, TypeError):
-            return False
+        return InputValidator.parse_day(day_str) is not None
     
     @staticmethod
     def sanitize_text(text: str, max_length: int = None) -> str:
@@ -99,10 +115,10 @@ class InputValidator:
             return ""
             
         # Eliminar caracteres de control y emojis problemáticos
-        sanitized = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', text)
+        sanitized = text.translate(_CTRL_TABLE)
         
         # Limitar longitud si se especifica
-        if max_length and len(sanitized) > max_length:
-            sanitized = sanitized[:max_length].strip()
+        if max_length:
+            sanitized = sanitized[:max_length]
             
         return sanitized.strip()
\ No newline at end of file